@@ -5,18 +5,24 @@ Version avec support des paires de labels alternées
 
 import streamlit as st
 from datetime import datetime
+import hashlib
 import json
+from io import BytesIO
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Optional
 import pandas as pd
-from collections import defaultdict
+import numpy as np
+import plotly.graph_objects as go
+from collections import defaultdict, Counter
 
 # Import des modules locaux
-from utils.excel_utils import load_workbook, get_sheet_names, num_to_excel_col
-from utils.color_detector import detect_all_colors
-from utils.zone_detector import detect_zones_with_alternating_pairs, detect_zones_with_two_colors
-from utils.visualization import create_excel_visualization, create_color_preview_html, create_zone_detail_view, create_dataframe_view
-from utils.export import export_to_json
-import plotly.express as px
+import openpyxl
+from utils.excel_utils import get_sheet_names, num_to_excel_col, excel_col_names, convert_xls_to_openpyxl
+from utils.color_detector import detect_all_colors, get_color_name, hex_to_rgb, rgb_and_text_color
+from utils.zone_detector import detect_zones_with_alternating_pairs, detect_zones_with_two_colors, get_zone_by_id, get_label_counts, merge_zones, LABEL_TYPES
+from utils.visualization import create_excel_visualization, create_zone_detail_view, create_dataframe_view
+from utils.export import json_to_bytes, json_array_to_bytes, value_to_text, COMPACT_JSON_MIN_ZONES
 
 st.set_page_config(
     page_title="📊 Déconstructurateur Excel - 4 Couleurs",
@@ -53,6 +59,184 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@lru_cache(maxsize=None)
+def _lazy_px():
+    """Import différé de plotly.express (coûteux au démarrage, inutile avant l'analyse)"""
+    import plotly.express as px
+    return px
+
+@st.cache_data(show_spinner=False)
+def cached_detect_colors(file_hash: str, sheet_name: str, _workbook):
+    """
+    Détection des couleurs d'une feuille, mise en cache par contenu de fichier
+    Le workbook n'entre pas dans la clé (préfixe _) : file_hash l'identifie
+    """
+    return detect_all_colors(_workbook, sheet_name)
+
+@st.cache_data(show_spinner=False)
+def scan_workbook_colors(file_hash: str, sheet_names: tuple, _workbook):
+    """
+    Analyse des couleurs de toutes les feuilles, mise en cache par contenu de fichier
+    Retourne (couleurs consolidées triées par occurrences, cellules colorées par feuille,
+    index inverse couleur -> [(feuille, cellule)] limité à quelques exemples)
+    """
+    color_counts = Counter()
+    all_sheets_color_cells = {}
+    color_to_locations = defaultdict(list)
+    
+    for sheet in sheet_names:
+        colors, color_cells = cached_detect_colors(file_hash, sheet, _workbook)
+        all_sheets_color_cells[sheet] = color_cells
+        
+        # Fusionner les couleurs
+        for color in colors:
+            color_counts[color['hex']] += color['count']
+        
+        # Exemples par couleur, construits en un seul passage
+        for hex_color, cells in color_cells.items():
+            locations = color_to_locations[hex_color]
+            if len(locations) < 3:
+                locations.extend((sheet, cell) for cell in cells[:3])
+    
+    # Liste consolidée, triée par nombre d'occurrences
+    consolidated_colors = [
+        {'hex': hex_color, 'name': get_color_name(hex_color), 'count': count}
+        for hex_color, count in color_counts.most_common()
+    ]
+    return consolidated_colors, all_sheets_color_cells, dict(color_to_locations)
+
+@st.cache_data(show_spinner=False)
+def cached_detect_zones(file_hash: str, sheet_name: str, palette_key: str, _workbook_ro, _workbook, _color_palette):
+    """
+    Détection des zones d'une feuille, mise en cache par (fichier, feuille, palette)
+    Les cellules colorées sont relues du cache de cached_detect_colors pour (file_hash, sheet_name),
+    jamais fournies par l'appelant : le résultat ne dépend que de la clé
+    """
+    _, color_cells = cached_detect_colors(file_hash, sheet_name, _workbook_ro)
+    return detect_zones_with_two_colors(_workbook, sheet_name, _color_palette, color_cells)
+
+def make_palette_key(color_palette: Dict) -> str:
+    """Clé hachable et stable pour une palette de couleurs"""
+    return json.dumps(color_palette, sort_keys=True)
+
+def make_zone_key(zone: Dict) -> tuple:
+    """Résumé hachable d'une zone (id, bornes, tailles) pour les clés de cache"""
+    bounds = zone['bounds']
+    return (zone['id'], bounds['min_row'], bounds['max_row'], bounds['min_col'], bounds['max_col'],
+            zone['cell_count'], len(zone.get('labels', [])))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_overview_fig(file_hash: str, sheet_name: str, zones_key: tuple, selected_zone, palette_key: str,
+                       _workbook, _zones, _color_mapping):
+    """Figure de la vue d'ensemble, reconstruite seulement si fichier/zones/sélection/palette changent"""
+    return create_excel_visualization(_workbook, sheet_name, _zones, selected_zone, _color_mapping)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_zone_detail_fig(file_hash: str, sheet_name: str, zone_key: tuple, palette_key: str,
+                          _workbook, _zone, _color_palette):
+    """Figure zoomée d'une zone, reconstruite seulement si la zone ou la palette changent"""
+    return create_zone_detail_view_pairs(_workbook, sheet_name, _zone, _color_palette)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_overview_table(file_hash: str, sheet_name: str, zones_key: tuple, palette_key: str, max_rows: int,
+                         _workbook, _zones, _color_mapping):
+    """
+    Vue tableau de la vue d'ensemble, reconstruite seulement si fichier/zones/palette/max_rows changent
+    Retourne le HTML stylé si des couleurs sont appliquées, sinon le DataFrame brut
+    """
+    df_view = create_dataframe_view(_workbook, sheet_name, _zones, _color_mapping, max_rows=max_rows)
+    if isinstance(df_view, pd.DataFrame):
+        return df_view
+    return df_view.to_html()  # Styler
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_color_histogram_fig(colors_key: tuple, top_k: int = 15):
+    """
+    Histogramme des couleurs détectées, limité aux top_k plus fréquentes
+    colors_key : tuple de (hex, nom, occurrences)
+    """
+    px = _lazy_px()
+    counts = np.fromiter((count for _, _, count in colors_key), dtype=np.int64, count=len(colors_key))
+    
+    # Top-K en O(N) sans supposer la liste déjà triée
+    if len(counts) > top_k:
+        idx = np.argpartition(-counts, top_k)[:top_k]
+    else:
+        idx = np.arange(len(counts))
+    idx = idx[np.argsort(-counts[idx], kind='stable')]
+    
+    # Construction colonnaire : les libellés et les couleurs sont dérivés par opérations vectorisées
+    top = pd.DataFrame.from_records([colors_key[i] for i in idx], columns=['hex', 'name', 'count'])
+    hex_codes = '#' + top['hex']
+    df_colors = pd.DataFrame({
+        'Couleur': top['name'] + ' (' + hex_codes + ')',
+        'Occurrences': counts[idx]
+    })
+    
+    fig = px.bar(
+        df_colors, 
+        x='Couleur', 
+        y='Occurrences',
+        title=f"Distribution des couleurs (Top {len(df_colors)} sur {len(colors_key)} détectées)"
+    )
+    
+    # Appliquer les vraies couleurs aux barres
+    fig.update_traces(marker_color=hex_codes.tolist())
+    
+    # Améliorer la mise en page
+    fig.update_layout(
+        showlegend=False, 
+        height=500,
+        xaxis_tickangle=-45,
+        margin=dict(b=150)  # Plus d'espace en bas pour les labels
+    )
+    
+    return fig
+
+def select_zone(zone_id):
+    """Callback : sélectionne une zone avant la réexécution du script"""
+    st.session_state.selected_zone = zone_id
+
+def update_sheet_stats(sheet_name):
+    """
+    Recalcule les totaux d'une feuille (zones, cellules, labels par type)
+    Appelé quand ses zones changent, pour que le résumé global n'ait pas à les parcourir
+    """
+    zones = st.session_state.all_sheets_zones.get(sheet_name, [])
+    label_counts = {'h1': 0, 'h2': 0, 'v1': 0, 'v2': 0}
+    total_cells = 0
+    
+    # Une seule passe sur les zones pour tous les totaux
+    for zone in zones:
+        total_cells += zone['cell_count']
+        for label_type, count in get_label_counts(zone).items():
+            label_counts[label_type] += count
+    
+    st.session_state.all_sheets_stats[sheet_name] = {
+        'zones': len(zones),
+        'cells': total_cells,
+        'labels': sum(label_counts.values()),
+        'label_counts': label_counts
+    }
+
+def merge_sheet_zones(sheet_name):
+    """Callback : fusionne les zones proches d'une feuille avant la réexécution"""
+    st.session_state.all_sheets_zones[sheet_name] = merge_zones(
+        st.session_state.all_sheets_zones[sheet_name], 
+        max_gap=1
+    )
+    # Les zones ne correspondent plus à la détection : une nouvelle détection la refera
+    st.session_state.all_sheets_zones_keys.pop(sheet_name, None)
+    update_sheet_stats(sheet_name)
+    st.toast("Zones fusionnées!")
+
+# Nombre de zones affichées par page dans les contrôles rapides
+ZONES_PER_PAGE = 20
+
+def change_zone_page(delta: int):
+    """Callback : page précédente / suivante de la liste des zones"""
+    st.session_state.zone_page = max(0, st.session_state.zone_page + delta)
+
 def init_session_state():
     """Initialise les variables de session"""
     if 'zones' not in st.session_state:
@@ -61,10 +245,24 @@ def init_session_state():
         st.session_state.current_sheet = None
     if 'workbook' not in st.session_state:
         st.session_state.workbook = None
+    if 'workbook_ro' not in st.session_state:
+        st.session_state.workbook_ro = None
+    if 'file_hash' not in st.session_state:
+        st.session_state.file_hash = None
+    if 'file_bytes' not in st.session_state:
+        st.session_state.file_bytes = None
     if 'selected_zone' not in st.session_state:
         st.session_state.selected_zone = None
+    if 'zone_page' not in st.session_state:
+        st.session_state.zone_page = 0
     if 'color_palette' not in st.session_state:
         st.session_state.color_palette = None
+    if 'label_meta' not in st.session_state:
+        st.session_state.label_meta = None
+    if 'label_names' not in st.session_state:
+        st.session_state.label_names = None
+    if 'global_color_analysis' not in st.session_state:
+        st.session_state.global_color_analysis = False
     if 'detected_colors' not in st.session_state:
         st.session_state.detected_colors = []
     if 'color_cells' not in st.session_state:
@@ -73,8 +271,14 @@ def init_session_state():
         st.session_state.label_pairs = []
     if 'all_sheets_zones' not in st.session_state:
         st.session_state.all_sheets_zones = {}
+    if 'all_sheets_zones_keys' not in st.session_state:
+        st.session_state.all_sheets_zones_keys = {}
+    if 'all_sheets_stats' not in st.session_state:
+        st.session_state.all_sheets_stats = {}
     if 'all_sheets_color_cells' not in st.session_state:
         st.session_state.all_sheets_color_cells = {}
+    if 'color_to_locations' not in st.session_state:
+        st.session_state.color_to_locations = {}
 
 def main():
     """Fonction principale de l'application"""
@@ -91,9 +295,16 @@ def main():
     
     if uploaded_file:
         try:
-            # Charger le workbook avec les valeurs calculées
-            st.session_state.workbook = load_workbook_with_values(uploaded_file)
-            sheet_names = get_sheet_names(st.session_state.workbook)
+            # Empreinte du contenu : clé de tous les caches liés au fichier
+            # Les octets sont lus une seule fois par exécution et servent à tous les chargements
+            file_bytes = uploaded_file.getvalue()
+            file_hash = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+            st.session_state.file_bytes = file_bytes
+            
+            # Charger le workbook en lecture seule (valeurs calculées) : suffit pour lister
+            # les feuilles, le workbook complet n'est ouvert qu'à la demande
+            open_workbook_read_only(uploaded_file, file_hash)
+            sheet_names = get_sheet_names(st.session_state.workbook_ro)
             
             # Étape 1: Configuration globale de la palette
             st.header("🎨 Étape 1: Configuration globale des couleurs")
@@ -101,39 +312,17 @@ def main():
             # Détection des couleurs sur toutes les feuilles
             if st.button("🔍 Analyser les couleurs dans tout le fichier", type="primary"):
                 with st.spinner("Analyse des couleurs en cours..."):
-                    all_colors = set()
-                    color_counts = defaultdict(int)
-                    st.session_state.all_sheets_color_cells = {}
-                    
-                    # Analyser toutes les feuilles
-                    for sheet in sheet_names:
-                        colors, color_cells = detect_all_colors(
-                            st.session_state.workbook, 
-                            sheet
-                        )
-                        
-                        # IMPORTANT: Sauvegarder les cellules colorées par feuille
-                        st.session_state.all_sheets_color_cells[sheet] = color_cells
-                        
-                        # Fusionner les couleurs
-                        for color in colors:
-                            color_hex = color['hex']
-                            color_counts[color_hex] += color['count']
-                            all_colors.add(color_hex)
-                    
-                    # Créer la liste consolidée des couleurs
-                    consolidated_colors = []
-                    for hex_color in all_colors:
-                        from utils.color_detector import get_color_name
-                        consolidated_colors.append({
-                            'hex': hex_color,
-                            'name': get_color_name(hex_color),
-                            'count': color_counts[hex_color]
-                        })
-                    
-                    # Trier par nombre d'occurrences
-                    consolidated_colors.sort(key=lambda x: x['count'], reverse=True)
+                    # Les remplissages sont lisibles en streaming : pas besoin du workbook complet
+                    consolidated_colors, all_sheets_color_cells, color_to_locations = scan_workbook_colors(
+                        st.session_state.file_hash,
+                        tuple(sheet_names),
+                        st.session_state.workbook_ro
+                    )
                     
+                    # IMPORTANT: Sauvegarder les cellules colorées par feuille
+                    # (copie superficielle : le résultat mis en cache reste intact)
+                    st.session_state.all_sheets_color_cells = dict(all_sheets_color_cells)
+                    st.session_state.color_to_locations = color_to_locations
                     st.session_state.detected_colors = consolidated_colors
                     st.session_state.global_color_analysis = True
                     
@@ -145,13 +334,10 @@ def main():
                             for color in consolidated_colors[:5]:
                                 st.write(f"**Couleur #{color['hex']} ({color['name']})** : {color['count']} cellules")
                                 # Afficher quelques exemples
-                                examples = []
-                                for sheet, cells_dict in st.session_state.all_sheets_color_cells.items():
-                                    if color['hex'] in cells_dict:
-                                        for cell in cells_dict[color['hex']][:3]:
-                                            examples.append(f"{sheet} - {num_to_excel_col(cell['col'])}{cell['row']}: {cell.get('value', '(vide)')}")
-                                        if len(examples) >= 3:
-                                            break
+                                examples = [
+                                    f"{sheet} - {num_to_excel_col(cell['col'])}{cell['row']}: {cell.get('value', '(vide)')}"
+                                    for sheet, cell in color_to_locations.get(color['hex'], [])
+                                ]
                                 if examples:
                                     st.write("Exemples :")
                                     for ex in examples[:5]:
@@ -160,7 +346,7 @@ def main():
                         st.warning("⚠️ Aucune couleur détectée dans le fichier.")
             
             # Afficher les couleurs détectées
-            if st.session_state.detected_colors and hasattr(st.session_state, 'global_color_analysis'):
+            if st.session_state.detected_colors and st.session_state.global_color_analysis:
                 display_detected_colors()
                 
                 # Configuration de la palette globale
@@ -170,12 +356,11 @@ def main():
                     display_selected_palette_pairs()
                     
                     # Bouton pour reconfigurer
-                    if st.button("🔄 Reconfigurer la palette"):
-                        st.session_state.color_palette = None
-                        st.rerun()
+                    st.button("🔄 Reconfigurer la palette", on_click=reset_color_palette)
             
             # Étape 2: Traitement des feuilles
             if st.session_state.color_palette:
+                get_full_workbook(uploaded_file)
                 st.header("📄 Étape 2: Traitement des feuilles")
                 
                 # Tabs pour le traitement
@@ -213,13 +398,12 @@ def main():
                     
                     with col2:
                         # Statistiques globales
-                        if hasattr(st.session_state, 'all_sheets_zones'):
-                            total_zones = sum(len(zones) for zones in st.session_state.all_sheets_zones.values())
-                            st.metric("Total zones", total_zones)
+                        total_zones = sum(stats['zones'] for stats in st.session_state.all_sheets_stats.values())
+                        st.metric("Total zones", total_zones)
                     
                     with col3:
                         # Export global
-                        if hasattr(st.session_state, 'all_sheets_zones') and st.session_state.all_sheets_zones:
+                        if st.session_state.all_sheets_zones:
                             if st.button("📥 Exporter tout en JSON"):
                                 json_data = export_all_sheets_json()
                                 st.download_button(
@@ -230,7 +414,7 @@ def main():
                                 )
                     
                     # Afficher le résumé par feuille
-                    if hasattr(st.session_state, 'all_sheets_zones'):
+                    if st.session_state.all_sheets_zones:
                         display_global_summary()
                 
         except Exception as e:
@@ -251,47 +435,12 @@ def display_detected_colors():
     # Visualisation de la distribution des couleurs
     st.markdown("### 📊 Distribution des couleurs")
     
-    if st.session_state.detected_colors:
-        # Préparer les données pour le graphique
-        color_data = []
-        color_map = {}
-        
-        # Prendre les 15 couleurs les plus fréquentes
-        for color in st.session_state.detected_colors[:15]:
-            color_name = f"{color['name']} (#{color['hex']})"
-            color_data.append({
-                'Couleur': color_name,
-                'Occurrences': color['count']
-            })
-            color_map[color_name] = f"#{color['hex']}"
-        
-        if color_data:
-            df_colors = pd.DataFrame(color_data)
-            
-            fig = px.bar(
-                df_colors, 
-                x='Couleur', 
-                y='Occurrences',
-                title=f"Distribution des couleurs (Top {len(color_data)} sur {len(st.session_state.detected_colors)} détectées)"
-            )
-            
-            # Appliquer les vraies couleurs aux barres
-            colors_list = [color_map.get(name, '#888888') for name in df_colors['Couleur']]
-            fig.update_traces(marker_color=colors_list)
-            
-            # Améliorer la mise en page
-            fig.update_layout(
-                showlegend=False, 
-                height=500,
-                xaxis_tickangle=-45,
-                margin=dict(b=150)  # Plus d'espace en bas pour les labels
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Informations supplémentaires
-            total_colored_cells = sum(c['count'] for c in st.session_state.detected_colors)
-            st.info(f"💡 Total : {total_colored_cells:,} cellules colorées détectées dans l'ensemble du fichier")
+    colors_key = tuple((c['hex'], c['name'], c['count']) for c in st.session_state.detected_colors)
+    st.plotly_chart(build_color_histogram_fig(colors_key), use_container_width=True)
+    
+    # Informations supplémentaires
+    total_colored_cells = sum(count for _, _, count in colors_key)
+    st.info(f"💡 Total : {total_colored_cells:,} cellules colorées détectées dans l'ensemble du fichier")
 
 def configure_color_palette_pairs_global():
     """Configure la palette de couleurs globale avec 4 couleurs indépendantes"""
@@ -321,10 +470,10 @@ def configure_color_palette_pairs_global():
     
     col1, col2 = st.columns(2)
     
-    used_colors = [color_options[zone_color]]
+    used_colors = {color_options[zone_color]}
     
     with col1:
-        available_h1 = [opt for opt in color_options.keys() if color_options[opt] not in used_colors]
+        available_h1 = [opt for opt, hex_c in color_options.items() if hex_c not in used_colors]
         h1_color = st.selectbox(
             "Couleur H1 (première couleur horizontale)",
             options=available_h1,
@@ -332,10 +481,10 @@ def configure_color_palette_pairs_global():
             help="Première couleur pour les headers horizontaux"
         )
         if h1_color:
-            used_colors.append(color_options[h1_color])
+            used_colors.add(color_options[h1_color])
     
     with col2:
-        available_h2 = [opt for opt in color_options.keys() if color_options[opt] not in used_colors]
+        available_h2 = [opt for opt, hex_c in color_options.items() if hex_c not in used_colors]
         h2_color = st.selectbox(
             "Couleur H2 (deuxième couleur horizontale)",
             options=available_h2,
@@ -343,7 +492,7 @@ def configure_color_palette_pairs_global():
             help="Deuxième couleur pour les headers horizontaux"
         )
         if h2_color:
-            used_colors.append(color_options[h2_color])
+            used_colors.add(color_options[h2_color])
     
     # Configuration des headers verticaux
     st.markdown("""
@@ -355,7 +504,7 @@ def configure_color_palette_pairs_global():
     col3, col4 = st.columns(2)
     
     with col3:
-        available_v1 = [opt for opt in color_options.keys() if color_options[opt] not in used_colors]
+        available_v1 = [opt for opt, hex_c in color_options.items() if hex_c not in used_colors]
         v1_color = st.selectbox(
             "Couleur V1 (première couleur verticale)",
             options=available_v1,
@@ -363,10 +512,10 @@ def configure_color_palette_pairs_global():
             help="Première couleur pour les headers verticaux"
         )
         if v1_color:
-            used_colors.append(color_options[v1_color])
+            used_colors.add(color_options[v1_color])
     
     with col4:
-        available_v2 = [opt for opt in color_options.keys() if color_options[opt] not in used_colors]
+        available_v2 = [opt for opt, hex_c in color_options.items() if hex_c not in used_colors]
         v2_color = st.selectbox(
             "Couleur V2 (deuxième couleur verticale)",
             options=available_v2,
@@ -374,7 +523,7 @@ def configure_color_palette_pairs_global():
             help="Deuxième couleur pour les headers verticaux"
         )
         if v2_color:
-            used_colors.append(color_options[v2_color])
+            used_colors.add(color_options[v2_color])
     
     # Explication du système
     with st.expander("💡 Comment fonctionne le système à 4 couleurs ?"):
@@ -403,80 +552,153 @@ def configure_color_palette_pairs_global():
         """)
     
     # Bouton de validation
-    if st.button("✅ Valider la palette globale", type="primary"):
-        if h1_color and h2_color and v1_color and v2_color:
-            all_colors = [
-                color_options[zone_color],
-                color_options[h1_color],
-                color_options[h2_color],
-                color_options[v1_color],
-                color_options[v2_color]
-            ]
-            
-            if len(all_colors) == len(set(all_colors)):
-                st.session_state.color_palette = {
-                    'zone_color': color_options[zone_color],
-                    'zone_name': zone_color.split(' (')[0],
-                    'h1_color': color_options[h1_color],
-                    'h1_name': h1_color.split(' (')[0],
-                    'h2_color': color_options[h2_color],
-                    'h2_name': h2_color.split(' (')[0],
-                    'v1_color': color_options[v1_color],
-                    'v1_name': v1_color.split(' (')[0],
-                    'v2_color': color_options[v2_color],
-                    'v2_name': v2_color.split(' (')[0]
-                }
-                st.success("✅ Palette globale configurée! Vous pouvez maintenant traiter les feuilles.")
-                st.rerun()
-            else:
-                st.error("❌ Toutes les couleurs doivent être différentes !")
-        else:
-            st.error("❌ Veuillez sélectionner toutes les couleurs !")
-            
+    st.button("✅ Valider la palette globale", type="primary",
+              on_click=validate_global_palette,
+              args=(color_options, zone_color, h1_color, h2_color, v1_color, v2_color))
+    
+    # Erreur éventuelle de la dernière validation (affichée une seule fois)
+    if st.session_state.get('palette_error'):
+        st.error(st.session_state.palette_error)
+        st.session_state.palette_error = None
+
+def validate_global_palette(color_options, zone_color, h1_color, h2_color, v1_color, v2_color):
+    """Callback : enregistre la palette globale si les 5 couleurs sont choisies et distinctes"""
+    if not (h1_color and h2_color and v1_color and v2_color):
+        st.session_state.palette_error = "❌ Veuillez sélectionner toutes les couleurs !"
+        return
+    
+    all_colors = [
+        color_options[zone_color],
+        color_options[h1_color],
+        color_options[h2_color],
+        color_options[v1_color],
+        color_options[v2_color]
+    ]
+    if len(all_colors) != len(set(all_colors)):
+        st.session_state.palette_error = "❌ Toutes les couleurs doivent être différentes !"
+        return
+    
+    # Noms repris des couleurs détectées plutôt que redécoupés depuis les libellés
+    color_name_by_hex = {c['hex']: c['name'] for c in st.session_state.detected_colors}
+    palette = {}
+    for key, option in (('zone', zone_color), ('h1', h1_color), ('h2', h2_color),
+                        ('v1', v1_color), ('v2', v2_color)):
+        hex_color = color_options[option]
+        palette[f'{key}_color'] = hex_color
+        palette[f'{key}_name'] = color_name_by_hex[hex_color]
+    label_meta = build_label_meta(palette)
+    st.session_state.color_palette = palette
+    st.session_state.label_meta = label_meta
+    st.session_state.label_names = {t: meta['name'] for t, meta in label_meta.items()}
+    st.toast("✅ Palette globale configurée! Vous pouvez maintenant traiter les feuilles.")
+
+def reset_color_palette():
+    """Callback : efface la palette pour la reconfigurer"""
+    st.session_state.color_palette = None
+    st.session_state.label_meta = None
+    st.session_state.label_names = None
+
+def build_label_meta(color_palette: Dict) -> Dict:
+    """Couleur et nom de chaque type de label (h1, h2, v1, v2) au format label_colors"""
+    return {
+        label_type: {'color': color_palette[f'{label_type}_color'], 'name': color_palette[f'{label_type}_name']}
+        for label_type in LABEL_TYPES
+        if f'{label_type}_color' in color_palette
+    }
+
+def get_label_meta() -> Dict:
+    """label_colors de la palette courante, construit une fois à la validation de la palette"""
+    if st.session_state.label_meta is None and st.session_state.color_palette:
+        st.session_state.label_meta = build_label_meta(st.session_state.color_palette)
+    return st.session_state.label_meta
+
+def get_label_names() -> Dict:
+    """Nom affiché de chaque type de label, établi une fois à la validation de la palette"""
+    if st.session_state.label_names is None and st.session_state.color_palette:
+        st.session_state.label_names = {t: meta['name'] for t, meta in get_label_meta().items()}
+    return st.session_state.label_names
+
+def get_sheet_color_cells(sheet_name):
+    """Cellules colorées d'une feuille, analysées à la demande si besoin"""
+    color_cells = st.session_state.all_sheets_color_cells.get(sheet_name)
+    if color_cells is None:
+        colors, color_cells = cached_detect_colors(
+            st.session_state.file_hash,
+            sheet_name,
+            st.session_state.workbook_ro
+        )
+        st.session_state.all_sheets_color_cells[sheet_name] = color_cells
+    return color_cells
+
+def make_detection_key(sheet_name):
+    """Clé de détection d'une feuille : (fichier, feuille, palette)"""
+    return (st.session_state.file_hash, sheet_name, make_palette_key(st.session_state.color_palette))
+
+def detect_sheet_zones(sheet_name):
+    """
+    Détecte et enregistre les zones d'une feuille, sans aucun affichage
+    Rien n'est recalculé si le fichier, la feuille et la palette n'ont pas changé
+    """
+    detection_key = make_detection_key(sheet_name)
+    if (st.session_state.all_sheets_zones_keys.get(sheet_name) == detection_key
+            and sheet_name in st.session_state.all_sheets_zones):
+        return st.session_state.all_sheets_zones[sheet_name]
+    
+    zones, label_data = cached_detect_zones(
+        st.session_state.file_hash,
+        sheet_name,
+        detection_key[2],
+        st.session_state.workbook_ro,
+        st.session_state.workbook,
+        st.session_state.color_palette
+    )
+    
+    # Sauvegarder les zones pour cette feuille
+    st.session_state.all_sheets_zones[sheet_name] = zones
+    st.session_state.all_sheets_zones_keys[sheet_name] = detection_key
+    update_sheet_stats(sheet_name)
+    return zones
+
 def process_single_sheet(sheet_name):
-    """Traite une seule feuille avec la palette globale - Version corrigée"""
+    """Traite une seule feuille avec la palette globale, avec le détail de la détection"""
+    # Rien à refaire si le fichier, la feuille et la palette n'ont pas changé
+    if (st.session_state.all_sheets_zones_keys.get(sheet_name) == make_detection_key(sheet_name)
+            and sheet_name in st.session_state.all_sheets_zones):
+        st.info(f"ℹ️ Zones de '{sheet_name}' déjà détectées avec cette palette")
+        return
+    
     with st.spinner(f"Traitement de la feuille '{sheet_name}'..."):
         # Récupérer les cellules colorées pour cette feuille
         if sheet_name in st.session_state.all_sheets_color_cells:
-            color_cells = st.session_state.all_sheets_color_cells[sheet_name]
             st.write(f"📌 Utilisation des couleurs détectées précédemment")
         else:
             # Si pas encore analysé, le faire maintenant
             st.warning(f"⚠️ Couleurs non détectées pour '{sheet_name}', analyse en cours...")
-            colors, color_cells = detect_all_colors(
-                st.session_state.workbook, 
-                sheet_name
-            )
-            st.session_state.all_sheets_color_cells[sheet_name] = color_cells
+        color_cells = get_sheet_color_cells(sheet_name)
         
         # Debug : vérifier que les couleurs sont présentes
         st.write("**Recherche des couleurs de la palette:**")
-        zone_color = st.session_state.color_palette['zone_color']
-        zone_cells = color_cells.get(zone_color, [])
-        st.write(f"- Zone ({zone_color}): {len(zone_cells)} cellules trouvées")
+        palette = st.session_state.color_palette
+        zone_color = palette['zone_color']
+        st.write(f"- Zone ({zone_color}): {len(color_cells.get(zone_color, ()))} cellules trouvées")
         
         # Afficher les infos pour chaque paire
-        if 'label_pairs' in st.session_state.color_palette:
-            for i, pair in enumerate(st.session_state.color_palette['label_pairs']):
+        label_pairs = palette.get('label_pairs')
+        if label_pairs:
+            for i, pair in enumerate(label_pairs):
                 h_color = pair['horizontal']['color']
                 v_color = pair['vertical']['color']
-                h_cells = color_cells.get(h_color, [])
-                v_cells = color_cells.get(v_color, [])
                 st.write(f"- Paire {i+1}:")
-                st.write(f"  - Horizontal ({h_color}): {len(h_cells)} cellules")
-                st.write(f"  - Vertical ({v_color}): {len(v_cells)} cellules")
+                st.write(f"  - Horizontal ({h_color}): {len(color_cells.get(h_color, ()))} cellules")
+                st.write(f"  - Vertical ({v_color}): {len(color_cells.get(v_color, ()))} cellules")
         
         # Détecter les zones avec le système adapté
-        zones, label_data = detect_zones_with_two_colors(
-            st.session_state.workbook,
-            sheet_name,
-            st.session_state.color_palette,
-            color_cells
-        )
+        zones = detect_sheet_zones(sheet_name)
         
         # Debug : afficher les détails des zones
         if zones:
-            total_labels = sum(len(z.get('labels', [])) for z in zones)
+            # Totaux enregistrés par detect_sheet_zones
+            total_labels = st.session_state.all_sheets_stats[sheet_name]['labels']
             st.write(f"📊 **Résultat**: {len(zones)} zones détectées, {total_labels} labels trouvés")
             
             # Afficher un échantillon des labels trouvés
@@ -485,20 +707,16 @@ def process_single_sheet(sheet_name):
                     for zone in zones[:2]:  # Premières 2 zones
                         if zone.get('labels'):
                             st.write(f"**Zone {zone['id']}:**")
-                            # Grouper par type
-                            h1_labels = [l for l in zone['labels'] if l['type'] == 'h1']
-                            h2_labels = [l for l in zone['labels'] if l['type'] == 'h2']
-                            v1_labels = [l for l in zone['labels'] if l['type'] == 'v1']
-                            v2_labels = [l for l in zone['labels'] if l['type'] == 'v2']
+                            # Grouper par type en une seule passe (3 premières valeurs par type)
+                            samples_by_type = {label_type: [] for label_type in LABEL_TYPES}
+                            for l in zone['labels']:
+                                samples = samples_by_type.get(l['type'])
+                                if samples is not None and len(samples) < 3:
+                                    samples.append(l.get('value', '(vide)'))
                             
-                            if h1_labels:
-                                st.write(f"  H1: {', '.join([l.get('value', '(vide)') for l in h1_labels[:3]])}")
-                            if h2_labels:
-                                st.write(f"  H2: {', '.join([l.get('value', '(vide)') for l in h2_labels[:3]])}")
-                            if v1_labels:
-                                st.write(f"  V1: {', '.join([l.get('value', '(vide)') for l in v1_labels[:3]])}")
-                            if v2_labels:
-                                st.write(f"  V2: {', '.join([l.get('value', '(vide)') for l in v2_labels[:3]])}")
+                            for label_type, samples in samples_by_type.items():
+                                if samples:
+                                    st.write(f"  {label_type.upper()}: {', '.join(samples)}")
             
             if total_labels == 0:
                 st.warning("⚠️ Aucun label trouvé malgré la détection de zones.")
@@ -510,11 +728,6 @@ def process_single_sheet(sheet_name):
             st.warning("⚠️ Aucune zone détectée!")
             st.info("Vérifiez que la couleur de zone sélectionnée est bien présente dans cette feuille.")
         
-        # Sauvegarder les zones pour cette feuille
-        if 'all_sheets_zones' not in st.session_state:
-            st.session_state.all_sheets_zones = {}
-        st.session_state.all_sheets_zones[sheet_name] = zones
-        
         st.success(f"✅ Traitement terminé pour '{sheet_name}'!")
 
 def process_all_sheets(sheet_names):
@@ -522,15 +735,16 @@ def process_all_sheets(sheet_names):
     progress_bar = st.progress(0)
     status_text = st.empty()
     
+    # Détection silencieuse : seule la progression est affichée
     for idx, sheet_name in enumerate(sheet_names):
         status_text.text(f"Traitement de '{sheet_name}'... ({idx+1}/{len(sheet_names)})")
-        process_single_sheet(sheet_name)
+        detect_sheet_zones(sheet_name)
         progress_bar.progress((idx + 1) / len(sheet_names))
     
     status_text.text("✅ Traitement terminé!")
     
     # Afficher le résumé
-    total_zones = sum(len(zones) for zones in st.session_state.all_sheets_zones.values())
+    total_zones = sum(stats['zones'] for stats in st.session_state.all_sheets_stats.values())
     st.success(f"🎉 Traitement terminé! {total_zones} zones détectées dans {len(sheet_names)} feuilles.")
 
 def display_sheet_results(sheet_name):
@@ -542,18 +756,12 @@ def display_sheet_results(sheet_name):
     tool_col1, tool_col2, tool_col3 = st.columns([1, 1, 1])
     
     with tool_col1:
-        if st.button("🔄 Rafraîchir", key=f"refresh_{sheet_name}"):
-            st.rerun()
+        # Le clic suffit à relancer le script
+        st.button("🔄 Rafraîchir", key=f"refresh_{sheet_name}")
     
     with tool_col2:
-        if st.button("🔀 Fusionner zones proches", key=f"merge_{sheet_name}"):
-            from utils.zone_detector import merge_zones
-            st.session_state.all_sheets_zones[sheet_name] = merge_zones(
-                st.session_state.all_sheets_zones[sheet_name], 
-                max_gap=1
-            )
-            st.success("Zones fusionnées!")
-            st.rerun()
+        st.button("🔀 Fusionner zones proches", key=f"merge_{sheet_name}",
+                  on_click=merge_sheet_zones, args=(sheet_name,))
     
     with tool_col3:
         if st.button("📥 Exporter cette feuille", key=f"export_{sheet_name}"):
@@ -581,44 +789,64 @@ def display_global_summary():
     """Affiche un résumé global de toutes les feuilles traitées"""
     st.markdown("### 📊 Résumé global")
     
-    summary_data = []
-    for sheet_name, zones in st.session_state.all_sheets_zones.items():
-        total_cells = sum(z['cell_count'] for z in zones)
-        total_labels = sum(len(z.get('labels', [])) for z in zones)
-        
-        summary_data.append({
-            'Feuille': sheet_name,
-            'Zones': len(zones),
-            'Cellules': total_cells,
-            'Labels': total_labels
-        })
+    summary_rows = []
+    for sheet_name in st.session_state.all_sheets_zones:
+        # Totaux maintenus à la détection et à la fusion
+        if sheet_name not in st.session_state.all_sheets_stats:
+            update_sheet_stats(sheet_name)
+        stats = st.session_state.all_sheets_stats[sheet_name]
+        summary_rows.append((sheet_name, stats['zones'], stats['cells'], stats['labels']))
     
-    df_summary = pd.DataFrame(summary_data)
+    df_summary = pd.DataFrame.from_records(summary_rows, columns=['Feuille', 'Zones', 'Cellules', 'Labels'])
     st.dataframe(df_summary, use_container_width=True)
     
-    # Graphiques récapitulatifs
+    # Graphiques récapitulatifs (mis en cache tant que les totaux sont inchangés)
+    fig1, fig2 = global_summary_figs(tuple(row[:3] for row in summary_rows))
     col1, col2 = st.columns(2)
     
     with col1:
-        fig1 = px.bar(df_summary, x='Feuille', y='Zones', 
-                      title="Nombre de zones par feuille")
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        fig2 = px.pie(df_summary, values='Cellules', names='Feuille',
-                      title="Répartition des cellules")
         st.plotly_chart(fig2, use_container_width=True)
 
+@st.cache_resource(show_spinner=False, max_entries=8)
+def global_summary_figs(summary_key: tuple):
+    """
+    Graphiques du résumé global, partagés par référence (pas de copie)
+    summary_key : tuple de (feuille, zones, cellules) ; les figures ne doivent pas être modifiées
+    """
+    px = _lazy_px()
+    df_summary = pd.DataFrame(list(summary_key), columns=['Feuille', 'Zones', 'Cellules'])
+    
+    fig1 = px.bar(df_summary, x='Feuille', y='Zones', 
+                  title="Nombre de zones par feuille")
+    fig2 = px.pie(df_summary, values='Cellules', names='Feuille',
+                  title="Répartition des cellules")
+    return fig1, fig2
+
 def export_single_sheet_json(sheet_name):
     """Exporte les données d'une seule feuille - Version corrigée"""
     zones = st.session_state.all_sheets_zones.get(sheet_name, [])
     return export_to_json_with_four_colors(zones, sheet_name, st.session_state.color_palette)
 
+def pair_headers_for_export(label_pairs):
+    """Headers h1/h2/v1/v2 d'une palette à paires : paire 1 -> h1/v1, paire 2 (facultative) -> h2/v2"""
+    def header(color_info):
+        return {"color": f"#{color_info['color']}", "name": color_info['name']}
+    
+    p0 = label_pairs[0]
+    p1 = label_pairs[1] if len(label_pairs) > 1 else None
+    empty = {"color": "", "name": ""}
+    return {
+        "h1": header(p0['horizontal']),
+        "h2": header(p1['horizontal']) if p1 else dict(empty),
+        "v1": header(p0['vertical']),
+        "v2": header(p1['vertical']) if p1 else dict(empty)
+    }
+
 def export_to_json_with_four_colors(zones, sheet_name, color_palette):
     """Exporte les zones avec le système à 4 couleurs en JSON"""
-    import json
-    from datetime import datetime
-    from utils.excel_utils import num_to_excel_col
     
     export_data = {
         "date_export": datetime.now().isoformat(),
@@ -632,49 +860,30 @@ def export_to_json_with_four_colors(zones, sheet_name, color_palette):
     
     # Ajouter les couleurs de headers selon le format
     if 'label_pairs' in color_palette:
-        export_data["color_palette"]["headers"] = {
-            "h1": {
-                "color": f"#{color_palette['label_pairs'][0]['horizontal']['color']}",
-                "name": color_palette['label_pairs'][0]['horizontal']['name']
-            },
-            "h2": {
-                "color": f"#{color_palette['label_pairs'][1]['horizontal']['color']}" if len(color_palette['label_pairs']) > 1 else "",
-                "name": color_palette['label_pairs'][1]['horizontal']['name'] if len(color_palette['label_pairs']) > 1 else ""
-            },
-            "v1": {
-                "color": f"#{color_palette['label_pairs'][0]['vertical']['color']}",
-                "name": color_palette['label_pairs'][0]['vertical']['name']
-            },
-            "v2": {
-                "color": f"#{color_palette['label_pairs'][1]['vertical']['color']}" if len(color_palette['label_pairs']) > 1 else "",
-                "name": color_palette['label_pairs'][1]['vertical']['name'] if len(color_palette['label_pairs']) > 1 else ""
-            }
-        }
+        export_data["color_palette"]["headers"] = pair_headers_for_export(color_palette['label_pairs'])
     else:
-        # Format direct
+        # Format direct : la palette validée porte les noms de ses couleurs
         export_data["color_palette"]["headers"] = {
-            "h1": {
-                "color": f"#{color_palette.get('h1_color', '')}",
-                "name": color_palette.get('h1_name', 'H1')
-            },
-            "h2": {
-                "color": f"#{color_palette.get('h2_color', '')}",
-                "name": color_palette.get('h2_name', 'H2')
-            },
-            "v1": {
-                "color": f"#{color_palette.get('v1_color', '')}",
-                "name": color_palette.get('v1_name', 'V1')
-            },
-            "v2": {
-                "color": f"#{color_palette.get('v2_color', '')}",
-                "name": color_palette.get('v2_name', 'V2')
+            label_type: {
+                "color": f"#{color_palette[f'{label_type}_color']}",
+                "name": color_palette[f'{label_type}_name']
             }
+            for label_type in LABEL_TYPES
         }
     
-    export_data["zones"] = []
+    # Gros exports : écriture incrémentale zone par zone, sans indentation
+    if len(zones) >= COMPACT_JSON_MIN_ZONES:
+        return json_array_to_bytes(export_data, "zones", ([zone_data] for zone_data in iter_zone_exports_four_colors(zones)))
     
-    # Exporter les zones
+    export_data["zones"] = list(iter_zone_exports_four_colors(zones))
+    return json_to_bytes(export_data)
+
+def iter_zone_exports_four_colors(zones):
+    """Produit les zones au format d'export 4 couleurs (labels par type), une à la fois"""
     for zone in zones:
+        labels = zone.get('labels', [])
+        # Table des lettres de colonnes couvrant la zone et ses labels
+        col_names = excel_col_names(max(zone['bounds']['max_col'], max((l['col'] for l in labels), default=0)))
         zone_data = {
             "id": zone['id'],
             "bounds": {
@@ -682,134 +891,107 @@ def export_to_json_with_four_colors(zones, sheet_name, color_palette):
                 "max_row": zone['bounds']['max_row'],
                 "min_col": zone['bounds']['min_col'],
                 "max_col": zone['bounds']['max_col'],
-                "min_col_letter": num_to_excel_col(zone['bounds']['min_col']),
-                "max_col_letter": num_to_excel_col(zone['bounds']['max_col'])
+                "min_col_letter": col_names[zone['bounds']['min_col']],
+                "max_col_letter": col_names[zone['bounds']['max_col']]
             },
             "cell_count": zone['cell_count'],
-            "cells": [],
-            "labels": {
-                "h1": [],
-                "h2": [],
-                "v1": [],
-                "v2": []
-            }
+            # Exporter les cellules
+            "cells": format_cells_for_export_pairs(zone['cells'], col_names),
+            "labels": {label_type: [] for label_type in LABEL_TYPES}
         }
         
-        # Exporter les cellules
-        for cell in zone['cells']:
-            zone_data["cells"].append({
-                "address": f"{num_to_excel_col(cell['col'])}{cell['row']}",
-                "row": cell['row'],
-                "col": cell['col'],
-                "col_letter": num_to_excel_col(cell['col']),
-                "value": str(cell.get('value', '')) if cell.get('value') is not None else ""
-            })
-        
-        # Organiser les labels par type
-        for label in zone.get('labels', []):
-            label_type = label.get('type', '')
-            if label_type in ['h1', 'h2', 'v1', 'v2']:
-                zone_data["labels"][label_type].append({
-                    "address": f"{num_to_excel_col(label['col'])}{label['row']}",
+        # Organiser les labels par type (un seul passage, types inconnus ignorés)
+        label_buckets = zone_data["labels"]
+        for label in labels:
+            bucket = label_buckets.get(label.get('type', ''))
+            if bucket is not None:
+                col_letter = col_names[label['col']]
+                bucket.append({
+                    "address": f"{col_letter}{label['row']}",
                     "row": label['row'],
                     "col": label['col'],
-                    "col_letter": num_to_excel_col(label['col']),
-                    "value": str(label.get('value', '')) if label.get('value') is not None else "",
+                    "col_letter": col_letter,
+                    "value": value_to_text(label.get('value')),
                     "distance": label.get('distance', 0)
                 })
         
-        export_data["zones"].append(zone_data)
+        yield zone_data
+
+def build_sheet_tags(sheet_name, zones, first_tag_id):
+    """Tags de l'export global pour une feuille : un tag par cellule de zone"""
+    # Nombre de tags connu d'avance : liste préallouée, remplie par index
+    tags = [None] * sum(len(zone['cells']) for zone in zones)
+    if not tags:
+        return tags
+    k = 0
+    tag_id = first_tag_id
+    for zone in zones:
+        # Labels de la zone répartis par type en un seul passage (ordre H1, H2, V1, V2),
+        # identiques pour toutes les cellules de la zone
+        buckets = {label_type: [] for label_type in LABEL_TYPES}
+        for label in zone.get('labels', []):
+            bucket = buckets.get(label.get('type'))
+            if bucket is not None and label.get('value'):
+                bucket.append(label)
+        zone_labels = [sheet_name]  # Le nom de la feuille est toujours le premier label
+        zone_sources = []
+        for label_type, bucket in buckets.items():
+            prefix = label_type.upper()
+            for label in bucket:
+                zone_labels.append(f"{prefix}:{label['value']}")
+                zone_sources.append(f"{num_to_excel_col(label['col'])}{label['row']}")
+        
+        col_names = excel_col_names(zone['bounds']['max_col'])
+        for cell in zone['cells']:
+            # Créer un tag pour chaque cellule de zone
+            cell_address = f"{col_names[cell['col']]}{cell['row']}"
+            # Ajouter la cellule elle-même (les labels sont partagés, jamais modifiés)
+            source_cells = zone_sources + [cell_address]
+            
+            tag = {
+                "id": tag_id,
+                "sheet_name": sheet_name,
+                "row": cell['row'],
+                "col": cell['col'],
+                "cell_address": cell_address,
+                "value": value_to_text(cell.get('value')),
+                "labels": zone_labels,
+                "source_cells": source_cells,
+                "zone_id": zone['id']
+            }
+            
+            tags[k] = tag
+            k += 1
+            tag_id += 1
     
-    return json.dumps(export_data, indent=2, ensure_ascii=False)
+    return tags
 
 def export_all_sheets_json():
     """Exporte toutes les feuilles dans un format global"""
+    palette = st.session_state.color_palette
+    all_sheets_zones = st.session_state.all_sheets_zones
     export_data = {
         "date_export": datetime.now().strftime("%Y-%m-%d"),
         "color_palette": {
-            "zone_color": f"#{st.session_state.color_palette['zone_color']}",
-            "zone_name": st.session_state.color_palette['zone_name']
-        },
-        "tags": []
+            "zone_color": f"#{palette['zone_color']}",
+            "zone_name": palette['zone_name']
+        }
     }
     
     # Ajouter la configuration des headers
-    if 'label_pairs' in st.session_state.color_palette:
-        export_data["color_palette"]["headers"] = {
-            "h1": {
-                "color": f"#{st.session_state.color_palette['label_pairs'][0]['horizontal']['color']}",
-                "name": st.session_state.color_palette['label_pairs'][0]['horizontal']['name']
-            },
-            "h2": {
-                "color": f"#{st.session_state.color_palette['label_pairs'][1]['horizontal']['color']}" if len(st.session_state.color_palette['label_pairs']) > 1 else "",
-                "name": st.session_state.color_palette['label_pairs'][1]['horizontal']['name'] if len(st.session_state.color_palette['label_pairs']) > 1 else ""
-            },
-            "v1": {
-                "color": f"#{st.session_state.color_palette['label_pairs'][0]['vertical']['color']}",
-                "name": st.session_state.color_palette['label_pairs'][0]['vertical']['name']
-            },
-            "v2": {
-                "color": f"#{st.session_state.color_palette['label_pairs'][1]['vertical']['color']}" if len(st.session_state.color_palette['label_pairs']) > 1 else "",
-                "name": st.session_state.color_palette['label_pairs'][1]['vertical']['name'] if len(st.session_state.color_palette['label_pairs']) > 1 else ""
-            }
-        }
-    
-    # Parcourir toutes les feuilles et créer les tags
-    tag_id = 1
-    for sheet_name, zones in st.session_state.all_sheets_zones.items():
-        for zone in zones:
-            for cell in zone['cells']:
-                # Créer un tag pour chaque cellule de zone
-                labels = [sheet_name]  # Le nom de la feuille est toujours le premier label
-                source_cells = []
-                
-                # Collecter les labels H1
-                h1_labels = [l for l in zone.get('labels', []) if l.get('type') == 'h1']
-                for label in h1_labels:
-                    if label.get('value'):
-                        labels.append(f"H1:{label['value']}")
-                        source_cells.append(f"{num_to_excel_col(label['col'])}{label['row']}")
-                
-                # Collecter les labels H2
-                h2_labels = [l for l in zone.get('labels', []) if l.get('type') == 'h2']
-                for label in h2_labels:
-                    if label.get('value'):
-                        labels.append(f"H2:{label['value']}")
-                        source_cells.append(f"{num_to_excel_col(label['col'])}{label['row']}")
-                
-                # Collecter les labels V1
-                v1_labels = [l for l in zone.get('labels', []) if l.get('type') == 'v1']
-                for label in v1_labels:
-                    if label.get('value'):
-                        labels.append(f"V1:{label['value']}")
-                        source_cells.append(f"{num_to_excel_col(label['col'])}{label['row']}")
-                
-                # Collecter les labels V2
-                v2_labels = [l for l in zone.get('labels', []) if l.get('type') == 'v2']
-                for label in v2_labels:
-                    if label.get('value'):
-                        labels.append(f"V2:{label['value']}")
-                        source_cells.append(f"{num_to_excel_col(label['col'])}{label['row']}")
-                
-                # Ajouter la cellule elle-même
-                source_cells.append(f"{num_to_excel_col(cell['col'])}{cell['row']}")
-                
-                tag = {
-                    "id": tag_id,
-                    "sheet_name": sheet_name,
-                    "row": cell['row'],
-                    "col": cell['col'],
-                    "cell_address": f"{num_to_excel_col(cell['col'])}{cell['row']}",
-                    "value": str(cell.get('value', '')),
-                    "labels": labels,
-                    "source_cells": source_cells,
-                    "zone_id": zone['id']
-                }
-                
-                export_data["tags"].append(tag)
-                tag_id += 1
-    
-    return json.dumps(export_data, indent=2, ensure_ascii=False)
+    if 'label_pairs' in palette:
+        export_data["color_palette"]["headers"] = pair_headers_for_export(palette['label_pairs'])
+    
+    # Écriture incrémentale : en-tête, puis les tags feuille par feuille,
+    # pour ne garder en mémoire que les tags d'une seule feuille à la fois
+    def iter_sheet_tags():
+        tag_id = 1
+        for sheet_name, zones in all_sheets_zones.items():
+            sheet_tags = build_sheet_tags(sheet_name, zones, tag_id)
+            tag_id += len(sheet_tags)
+            yield sheet_tags
+    
+    return json_array_to_bytes(export_data, "tags", iter_sheet_tags())
 
 
     """Configure la palette de couleurs avec système de paires"""
@@ -960,60 +1142,32 @@ def validate_and_detect_zones_pairs(selected_sheet, zone_color, zone_name, pairs
         st.success(f"✅ {len(zones)} zones détectées avec leurs labels alternés!")
 
 def display_selected_palette_pairs():
-    """Affiche la palette sélectionnée - Version 4 couleurs"""
+    """Affiche la palette sélectionnée - Version 4 couleurs (un seul bloc HTML)"""
+    palette = st.session_state.color_palette
     st.subheader("Palette configurée:")
     
-    # Zone de données
-    st.markdown(f"""
-    <div style="display: flex; align-items: center; margin: 10px 0;">
-        <div class="color-preview" style="background-color: #{st.session_state.color_palette['zone_color']}; margin-right: 10px;"></div>
-        <strong>Zones de données:</strong> {st.session_state.color_palette['zone_name']}
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Headers horizontaux
-    st.markdown("**Headers Horizontaux:**")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if 'h1_color' in st.session_state.color_palette:
-            st.markdown(f"""
-            <div style="display: flex; align-items: center; margin: 10px 0;">
-                <div class="color-preview" style="background-color: #{st.session_state.color_palette['h1_color']}; width: 25px; height: 25px;"></div>
-                <span>H1: {st.session_state.color_palette['h1_name']}</span>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with col2:
-        if 'h2_color' in st.session_state.color_palette:
-            st.markdown(f"""
-            <div style="display: flex; align-items: center; margin: 10px 0;">
-                <div class="color-preview" style="background-color: #{st.session_state.color_palette['h2_color']}; width: 25px; height: 25px;"></div>
-                <span>H2: {st.session_state.color_palette['h2_name']}</span>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # Headers verticaux
-    st.markdown("**Headers Verticaux:**")
-    col3, col4 = st.columns(2)
-    
-    with col3:
-        if 'v1_color' in st.session_state.color_palette:
-            st.markdown(f"""
-            <div style="display: flex; align-items: center; margin: 10px 0;">
-                <div class="color-preview" style="background-color: #{st.session_state.color_palette['v1_color']}; width: 25px; height: 25px;"></div>
-                <span>V1: {st.session_state.color_palette['v1_name']}</span>
-            </div>
-            """, unsafe_allow_html=True)
+    def swatch(label_type):
+        """Pastille d'un type de header, vide si la couleur n'est pas configurée"""
+        if f'{label_type}_color' not in palette:
+            return ''
+        return (
+            '<div style="display: flex; align-items: center; margin: 10px 0;">'
+            f'<div class="color-preview" style="background-color: #{palette[f"{label_type}_color"]}; width: 25px; height: 25px;"></div>'
+            f'<span>{label_type.upper()}: {palette[f"{label_type}_name"]}</span></div>'
+        )
     
-    with col4:
-        if 'v2_color' in st.session_state.color_palette:
-            st.markdown(f"""
-            <div style="display: flex; align-items: center; margin: 10px 0;">
-                <div class="color-preview" style="background-color: #{st.session_state.color_palette['v2_color']}; width: 25px; height: 25px;"></div>
-                <span>V2: {st.session_state.color_palette['v2_name']}</span>
-            </div>
-            """, unsafe_allow_html=True)
+    html = (
+        # Zone de données
+        '<div style="display: flex; align-items: center; margin: 10px 0;">'
+        f'<div class="color-preview" style="background-color: #{palette["zone_color"]}; margin-right: 10px;"></div>'
+        f'<strong>Zones de données:</strong>&nbsp;{palette["zone_name"]}</div>'
+        # Headers horizontaux puis verticaux
+        '<p><strong>Headers Horizontaux:</strong></p>'
+        + two_column_html(swatch('h1'), swatch('h2'))
+        + '<p><strong>Headers Verticaux:</strong></p>'
+        + two_column_html(swatch('v1'), swatch('v2'))
+    )
+    st.markdown(html, unsafe_allow_html=True)
 
 
 def display_results(selected_sheet):
@@ -1029,7 +1183,6 @@ def display_results(selected_sheet):
     
     with tool_col2:
         if st.button("🔀 Fusionner zones proches"):
-            from utils.zone_detector import merge_zones
             st.session_state.zones = merge_zones(st.session_state.zones, max_gap=1)
             st.success("Zones fusionnées!")
             st.rerun()
@@ -1064,8 +1217,45 @@ def display_results(selected_sheet):
     with tab3:
         display_statistics_tab_pairs()
 
+def two_column_html(left: str, right: str) -> str:
+    """Deux colonnes HTML côte à côte (remplace st.columns pour un bloc purement statique)"""
+    return ('<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">'
+            f'<div>{left}</div><div>{right}</div></div>')
+
+@lru_cache(maxsize=16)
+def legend_html_pairs(zone_color: str, h1_color: str, h1_name: str, h2_color: str, h2_name: str,
+                      v1_color: str, v1_name: str, v2_color: str, v2_name: str) -> str:
+    """
+    HTML complet de la légende 4 couleurs (zone, headers horizontaux, headers verticaux),
+    mémorisé par palette et rendu en un seul st.markdown
+    """
+    zone_html = (
+        '<div style="display: flex; align-items: center; margin: 5px 0;">'
+        f'<div style="width: 20px; height: 20px; background-color: #{zone_color}; border: 1px solid black; margin-right: 10px;"></div>'
+        '<span>Zones de données</span></div>'
+    )
+    
+    def swatch(color, text):
+        return (
+            '<div style="display: flex; align-items: center; margin: 5px 0;">'
+            f'<div style="width: 15px; height: 15px; background-color: #{color}; border: 1px solid black; margin-right: 5px;"></div>'
+            f'<span style="font-size: 0.9em;">{text}</span></div>'
+        )
+    
+    h_html = swatch(h1_color, f"H1: {h1_name}") + swatch(h2_color, f"H2: {h2_name}")
+    v_html = swatch(v1_color, f"V1: {v1_name}") + swatch(v2_color, f"V2: {v2_name}")
+    return zone_html + two_column_html(
+        f"<strong>Headers Horizontaux:</strong>{h_html}",
+        f"<strong>Headers Verticaux:</strong>{v_html}"
+    )
+
 def display_overview_tab_pairs(selected_sheet):
     """Affiche l'onglet vue d'ensemble - Version 4 couleurs"""
+    palette = st.session_state.color_palette
+    label_meta = get_label_meta()
+    zones = st.session_state.zones
+    workbook = st.session_state.workbook
+    
     # Sous-tabs pour différentes vues
     view_tab1, view_tab2 = st.tabs(["🗺️ Vue schématique", "📋 Vue tableau"])
     
@@ -1074,19 +1264,16 @@ def display_overview_tab_pairs(selected_sheet):
         
         with col1:
             # Vue Plotly adaptée pour 4 couleurs
-            adapted_palette = st.session_state.color_palette.copy()
-            adapted_palette['label_colors'] = {
-                'h1': {'color': st.session_state.color_palette['h1_color'], 'name': st.session_state.color_palette['h1_name']},
-                'h2': {'color': st.session_state.color_palette['h2_color'], 'name': st.session_state.color_palette['h2_name']},
-                'v1': {'color': st.session_state.color_palette['v1_color'], 'name': st.session_state.color_palette['v1_name']},
-                'v2': {'color': st.session_state.color_palette['v2_color'], 'name': st.session_state.color_palette['v2_name']}
-            }
+            adapted_palette = {**palette, 'label_colors': label_meta}
             
-            fig = create_excel_visualization(
-                st.session_state.workbook,
+            fig = build_overview_fig(
+                st.session_state.file_hash,
                 selected_sheet,
-                st.session_state.zones,
+                tuple(make_zone_key(z) for z in zones),
                 st.session_state.selected_zone,
+                make_palette_key(adapted_palette),
+                workbook,
+                zones,
                 adapted_palette
             )
             st.plotly_chart(fig, use_container_width=True)
@@ -1094,110 +1281,131 @@ def display_overview_tab_pairs(selected_sheet):
             # Légende pour 4 couleurs
             st.markdown("### 🎯 Légende")
             
-            # Zone
-            st.markdown(f"""
-            <div style="display: flex; align-items: center; margin: 5px 0;">
-                <div style="width: 20px; height: 20px; background-color: #{st.session_state.color_palette['zone_color']}; border: 1px solid black; margin-right: 10px;"></div>
-                <span>Zones de données</span>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Headers
-            col_leg1, col_leg2 = st.columns(2)
-            
-            with col_leg1:
-                st.markdown("**Headers Horizontaux:**")
-                st.markdown(f"""
-                <div style="display: flex; align-items: center; margin: 5px 0;">
-                    <div style="width: 15px; height: 15px; background-color: #{st.session_state.color_palette['h1_color']}; border: 1px solid black; margin-right: 5px;"></div>
-                    <span style="font-size: 0.9em;">H1: {st.session_state.color_palette['h1_name']}</span>
-                </div>
-                <div style="display: flex; align-items: center; margin: 5px 0;">
-                    <div style="width: 15px; height: 15px; background-color: #{st.session_state.color_palette['h2_color']}; border: 1px solid black; margin-right: 5px;"></div>
-                    <span style="font-size: 0.9em;">H2: {st.session_state.color_palette['h2_name']}</span>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col_leg2:
-                st.markdown("**Headers Verticaux:**")
-                st.markdown(f"""
-                <div style="display: flex; align-items: center; margin: 5px 0;">
-                    <div style="width: 15px; height: 15px; background-color: #{st.session_state.color_palette['v1_color']}; border: 1px solid black; margin-right: 5px;"></div>
-                    <span style="font-size: 0.9em;">V1: {st.session_state.color_palette['v1_name']}</span>
-                </div>
-                <div style="display: flex; align-items: center; margin: 5px 0;">
-                    <div style="width: 15px; height: 15px; background-color: #{st.session_state.color_palette['v2_color']}; border: 1px solid black; margin-right: 5px;"></div>
-                    <span style="font-size: 0.9em;">V2: {st.session_state.color_palette['v2_name']}</span>
-                </div>
-                """, unsafe_allow_html=True)
+            legend_html = legend_html_pairs(
+                palette['zone_color'],
+                palette['h1_color'], palette['h1_name'], palette['h2_color'], palette['h2_name'],
+                palette['v1_color'], palette['v1_name'], palette['v2_color'], palette['v2_name']
+            )
+            st.markdown(legend_html, unsafe_allow_html=True)
         
         with col2:
             st.markdown("### 🎮 Contrôles rapides")
             
+            # Liste paginée des zones : seules ZONES_PER_PAGE zones génèrent des widgets
+            page_count = max(1, (len(zones) + ZONES_PER_PAGE - 1) // ZONES_PER_PAGE)
+            page = min(st.session_state.zone_page, page_count - 1)
+            st.session_state.zone_page = page
+            
+            if page_count > 1:
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    st.button("◀", key="zone_page_prev", disabled=page == 0,
+                              on_click=change_zone_page, args=(-1,))
+                with col_page:
+                    st.caption(f"Page {page + 1}/{page_count}")
+                with col_next:
+                    st.button("▶", key="zone_page_next", disabled=page >= page_count - 1,
+                              on_click=change_zone_page, args=(1,))
+            
             # Liste des zones avec statistiques de labels
-            for zone in st.session_state.zones:
-                # Compter les labels par type
-                label_counts = {'h1': 0, 'h2': 0, 'v1': 0, 'v2': 0}
-                for label in zone.get('labels', []):
-                    label_type = label.get('type', '')
-                    if label_type in label_counts:
-                        label_counts[label_type] += 1
+            for zone in zones[page * ZONES_PER_PAGE:(page + 1) * ZONES_PER_PAGE]:
+                # Compteurs de labels précalculés à la détection
+                label_counts = get_label_counts(zone)
                 
                 # Afficher la zone
                 with st.container():
-                    if st.button(f"Zone {zone['id']} ({zone['cell_count']} cellules)", 
-                                key=f"select_zone_{zone['id']}",
-                                use_container_width=True):
-                        st.session_state.selected_zone = zone['id']
-                        st.rerun()
+                    st.button(f"Zone {zone['id']} ({zone['cell_count']} cellules)", 
+                              key=f"select_zone_{zone['id']}",
+                              use_container_width=True,
+                              on_click=select_zone,
+                              args=(zone['id'],))
                     
                     # Afficher les stats de labels
                     stats_text = f"H1:{label_counts['h1']} H2:{label_counts['h2']} V1:{label_counts['v1']} V2:{label_counts['v2']}"
                     st.caption(stats_text)
     
     with view_tab2:
-        st.markdown("### 📊 Vue tableau avec contenu des cellules")
-        
-        # Options d'affichage
+        display_overview_table_pairs(selected_sheet)
+
+@st.fragment
+def display_overview_table_pairs(selected_sheet):
+    """
+    Vue tableau de la vue d'ensemble
+    Fragment : ses options d'affichage ne réexécutent que ce tableau
+    """
+    palette = st.session_state.color_palette
+    label_meta = get_label_meta()
+    zones = st.session_state.zones
+    
+    st.markdown("### 📊 Vue tableau avec contenu des cellules")
+    
+    # Options d'affichage, appliquées ensemble à la validation du formulaire
+    with st.form(f"overview_table_options_{selected_sheet}"):
         col1, col2, col3 = st.columns([1, 1, 2])
         with col1:
             show_colors = st.checkbox("Afficher les couleurs", value=True)
         with col2:
             max_rows = st.number_input("Nombre de lignes max", min_value=10, max_value=200, value=50)
+        with col3:
+            st.form_submit_button("Appliquer")
+    
+    # Créer la vue tableau
+    try:
+        adapted_palette = {**palette, 'label_colors': label_meta}
         
-        # Créer la vue tableau
-        try:
-            adapted_palette = st.session_state.color_palette.copy()
-            adapted_palette['label_colors'] = {
-                'h1': {'color': st.session_state.color_palette['h1_color']},
-                'h2': {'color': st.session_state.color_palette['h2_color']},
-                'v1': {'color': st.session_state.color_palette['v1_color']},
-                'v2': {'color': st.session_state.color_palette['v2_color']}
-            }
-            
-            df_styled = create_dataframe_view(
-                st.session_state.workbook,
-                selected_sheet,
-                st.session_state.zones if show_colors else None,
-                adapted_palette if show_colors else None,
-                max_rows=max_rows
-            )
+        table_view = build_overview_table(
+            st.session_state.file_hash,
+            selected_sheet,
+            tuple(make_zone_key(z) for z in zones) if show_colors else (),
+            make_palette_key(adapted_palette) if show_colors else "",
+            int(max_rows),
+            st.session_state.workbook,
+            zones if show_colors else None,
+            adapted_palette if show_colors else None
+        )
+        
+        if isinstance(table_view, str):
+            st.markdown(table_view, unsafe_allow_html=True)
+        else:
+            st.dataframe(table_view, use_container_width=True, height=600)
             
-            if show_colors and hasattr(df_styled, 'to_html'):
-                st.markdown(df_styled.to_html(), unsafe_allow_html=True)
-            else:
-                st.dataframe(df_styled, use_container_width=True, height=600)
-                
-        except Exception as e:
-            st.error(f"Erreur lors de la création de la vue tableau: {str(e)}")
+    except Exception as e:
+        st.error(f"Erreur lors de la création de la vue tableau: {str(e)}")
+
+def build_labels_dataframe(labels: List[Dict], label_names: Dict) -> pd.DataFrame:
+    """Tableau des labels d'une zone, construit colonne par colonne (sans dict par ligne)"""
+    n = len(labels)
+    
+    rows = np.fromiter((l['row'] for l in labels), dtype=np.int32, count=n)
+    cols = np.fromiter((l['col'] for l in labels), dtype=np.int32, count=n)
+    distances = np.fromiter((l.get('distance', 0) for l in labels), dtype=np.int32, count=n)
+    types = pd.Series([l.get('type', '') for l in labels])
+    
+    col_names = excel_col_names(int(cols.max()) if n else 0)
+    
+    return pd.DataFrame({
+        'Position': [f"{col_names[c]}{r}" for c, r in zip(cols.tolist(), rows.tolist())],
+        'Type': types.map(label_names).fillna(types.str.upper()),
+        'Direction': [l.get('direction', '') for l in labels],
+        'Valeur': [l.get('value', '') for l in labels],
+        'Distance': distances
+    })
 
+@st.fragment
 def display_detailed_tab_pairs(selected_sheet):
-    """Affiche l'onglet vue détaillée pour les paires"""
+    """
+    Affiche l'onglet vue détaillée pour les paires
+    Fragment : navigation et options ne réexécutent que cet onglet
+    """
     if not st.session_state.selected_zone:
         st.info("👆 Sélectionnez une zone dans l'onglet 'Vue d'ensemble' pour voir les détails")
         return
     
-    zone = next((z for z in st.session_state.zones if z['id'] == st.session_state.selected_zone), None)
+    palette = st.session_state.color_palette
+    zones = st.session_state.zones
+    workbook = st.session_state.workbook
+    
+    zone = get_zone_by_id(zones, st.session_state.selected_zone)
     if not zone:
         return
     
@@ -1206,29 +1414,30 @@ def display_detailed_tab_pairs(selected_sheet):
     with col1:
         st.markdown(f"### Zone {zone['id']}")
     with col2:
-        if st.button("⬅️ Zone précédente", disabled=zone['id'] == 1):
-            st.session_state.selected_zone = max(1, zone['id'] - 1)
-            st.rerun()
+        st.button("⬅️ Zone précédente", disabled=zone['id'] == 1,
+                  on_click=select_zone, args=(max(1, zone['id'] - 1),))
     with col3:
-        if st.button("Zone suivante ➡️", disabled=zone['id'] == len(st.session_state.zones)):
-            st.session_state.selected_zone = min(len(st.session_state.zones), zone['id'] + 1)
-            st.rerun()
+        st.button("Zone suivante ➡️", disabled=zone['id'] == len(zones),
+                  on_click=select_zone, args=(min(len(zones), zone['id'] + 1),))
     
     # TABS pour différentes vues de la zone
     detail_view_tab1, detail_view_tab2, detail_view_tab3 = st.tabs([
         "🗺️ Vue schématique", 
         "📋 Vue tableau", 
-        "📊 Labels par paire"
+        "📊 Labels"
     ])
     
     with detail_view_tab1:
         # Vue schématique (Plotly)
         st.markdown("#### 🔍 Vue zoomée de la zone")
-        zoom_fig = create_zone_detail_view_pairs(
-            st.session_state.workbook,
+        zoom_fig = build_zone_detail_fig(
+            st.session_state.file_hash,
             selected_sheet,
+            make_zone_key(zone),
+            make_palette_key(palette),
+            workbook,
             zone,
-            st.session_state.color_palette
+            palette
         )
         st.plotly_chart(zoom_fig, use_container_width=True)
     
@@ -1246,20 +1455,20 @@ def display_detailed_tab_pairs(selected_sheet):
             show_legend = st.checkbox("Afficher la légende", value=True)
         
         try:
+            # Valeurs de la feuille lues une fois par fichier, pas à chaque navigation
+            sheet_values = cached_sheet_values(st.session_state.file_hash, selected_sheet, workbook)
             if table_style == "Avec marqueurs":
                 styled_table = create_zone_detail_table_view_pairs_enhanced(
-                    st.session_state.workbook,
-                    selected_sheet,
+                    sheet_values,
                     zone,
-                    st.session_state.color_palette,
+                    palette,
                     show_markers
                 )
             else:
                 styled_table = create_zone_detail_table_view_pairs(
-                    st.session_state.workbook,
-                    selected_sheet,
+                    sheet_values,
                     zone,
-                    st.session_state.color_palette
+                    palette
                 )
             
             # Afficher le tableau
@@ -1272,97 +1481,55 @@ def display_detailed_tab_pairs(selected_sheet):
             if show_legend:
                 st.markdown("#### 🎨 Légende")
                 
-                # Zone
-                zone_color = st.session_state.color_palette['zone_color']
-                st.markdown(f"""
-                <div style="display: flex; align-items: center; margin: 5px 0;">
-                    <div style="width: 20px; height: 20px; background-color: #{zone_color}; opacity: 0.3; border: 3px solid #{zone_color}; margin-right: 10px;"></div>
-                    <span>🔵 Cellules de zone</span>
-                </div>
-                """, unsafe_allow_html=True)
+                # Zone puis paires, rendues en un seul bloc HTML
+                def swatch(color, text, opacity, border):
+                    return (
+                        '<div style="display: flex; align-items: center; margin: 5px 0;">'
+                        f'<div style="width: 20px; height: 20px; background-color: #{color}; opacity: {opacity}; '
+                        f'border: {border}px solid #{color}; margin-right: 10px;"></div>'
+                        f'<span>{text}</span></div>'
+                    )
                 
-                # Paires
-                if 'label_pairs' in st.session_state.color_palette:
-                    for i, pair in enumerate(st.session_state.color_palette['label_pairs']):
-                        st.markdown(f"**Paire {i+1}:**")
-                        leg_col1, leg_col2 = st.columns(2)
-                        
-                        with leg_col1:
-                            h_color = pair['horizontal']['color']
-                            st.markdown(f"""
-                            <div style="display: flex; align-items: center; margin: 5px 0;">
-                                <div style="width: 20px; height: 20px; background-color: #{h_color}; opacity: 0.5; border: 2px solid #{h_color}; margin-right: 10px;"></div>
-                                <span>➡️ {pair['horizontal']['name']}</span>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with leg_col2:
-                            v_color = pair['vertical']['color']
-                            st.markdown(f"""
-                            <div style="display: flex; align-items: center; margin: 5px 0;">
-                                <div style="width: 20px; height: 20px; background-color: #{v_color}; opacity: 0.5; border: 2px solid #{v_color}; margin-right: 10px;"></div>
-                                <span>⬇️ {pair['vertical']['name']}</span>
-                            </div>
-                            """, unsafe_allow_html=True)
+                legend_parts = [swatch(palette['zone_color'], "🔵 Cellules de zone", 0.3, 3)]
+                for i, pair in enumerate(palette.get('label_pairs', [])):
+                    legend_parts.append(f"<p><strong>Paire {i+1}:</strong></p>")
+                    legend_parts.append(two_column_html(
+                        swatch(pair['horizontal']['color'], f"➡️ {pair['horizontal']['name']}", 0.5, 2),
+                        swatch(pair['vertical']['color'], f"⬇️ {pair['vertical']['name']}", 0.5, 2)
+                    ))
+                st.markdown("".join(legend_parts), unsafe_allow_html=True)
         
         except Exception as e:
             st.error(f"Erreur lors de la création de la vue tableau: {str(e)}")
             st.info("Essayez de réduire la taille de la zone ou vérifiez vos données.")
     
     with detail_view_tab3:
-        # Tableau des labels avec regroupement par paire
-        st.markdown("#### 📊 Labels identifiés (par paire)")
+        # Tableau des labels, séparé par direction
+        st.markdown("#### 📊 Labels identifiés")
         
         if zone.get('labels'):
-            # Regrouper les labels par paire et direction
-            labels_by_pair = defaultdict(lambda: {'horizontal': [], 'vertical': []})
+            labels_df = build_labels_dataframe(zone['labels'], get_label_names())
+            is_horizontal = labels_df['Direction'] == 'horizontal'
+            h_df = labels_df[is_horizontal].drop(columns='Direction')
+            v_df = labels_df[~is_horizontal].drop(columns='Direction')
             
-            for label in zone['labels']:
-                if 'pair_id' in label:
-                    labels_by_pair[label['pair_id']][label['direction']].append(label)
+            col1, col2 = st.columns(2)
             
-            # Afficher chaque paire
-            for pair_id in sorted(labels_by_pair.keys()):
-                pair_labels = labels_by_pair[pair_id]
-                pair_name = f"Paire {pair_id + 1}"
-                
-                if pair_id < len(st.session_state.color_palette.get('label_pairs', [])):
-                    pair_config = st.session_state.color_palette['label_pairs'][pair_id]
-                
-                with st.expander(f"🔗 {pair_name} ({len(pair_labels['horizontal'])} H, {len(pair_labels['vertical'])} V)"):
-                    col1, col2 = st.columns(2)
-                    
-                    # Labels horizontaux
-                    with col1:
-                        st.markdown("**Labels Horizontaux**")
-                        if pair_labels['horizontal']:
-                            h_data = []
-                            for label in pair_labels['horizontal']:
-                                from utils.excel_utils import num_to_excel_col
-                                h_data.append({
-                                    'Position': f"{num_to_excel_col(label['col'])}{label['row']}",
-                                    'Valeur': label.get('value', ''),
-                                    'Distance': label.get('distance', 0)
-                                })
-                            st.dataframe(pd.DataFrame(h_data), use_container_width=True)
-                        else:
-                            st.info("Aucun label horizontal")
-                    
-                    # Labels verticaux
-                    with col2:
-                        st.markdown("**Labels Verticaux**")
-                        if pair_labels['vertical']:
-                            v_data = []
-                            for label in pair_labels['vertical']:
-                                from utils.excel_utils import num_to_excel_col
-                                v_data.append({
-                                    'Position': f"{num_to_excel_col(label['col'])}{label['row']}",
-                                    'Valeur': label.get('value', ''),
-                                    'Distance': label.get('distance', 0)
-                                })
-                            st.dataframe(pd.DataFrame(v_data), use_container_width=True)
-                        else:
-                            st.info("Aucun label vertical")
+            # Labels horizontaux
+            with col1:
+                st.markdown(f"**Labels Horizontaux ({len(h_df)})**")
+                if not h_df.empty:
+                    st.dataframe(h_df, use_container_width=True, hide_index=True)
+                else:
+                    st.info("Aucun label horizontal")
+            
+            # Labels verticaux
+            with col2:
+                st.markdown(f"**Labels Verticaux ({len(v_df)})**")
+                if not v_df.empty:
+                    st.dataframe(v_df, use_container_width=True, hide_index=True)
+                else:
+                    st.info("Aucun label vertical")
         else:
             st.warning("Aucun label identifié pour cette zone")
     
@@ -1371,129 +1538,221 @@ def display_detailed_tab_pairs(selected_sheet):
     info_col1, info_col2 = st.columns(2)
     
     with info_col1:
-        from utils.excel_utils import num_to_excel_col
         st.write(f"**Lignes:** {zone['bounds']['min_row']} à {zone['bounds']['max_row']}")
         st.write(f"**Colonnes:** {num_to_excel_col(zone['bounds']['min_col'])} à {num_to_excel_col(zone['bounds']['max_col'])}")
         st.write(f"**Nombre de cellules:** {zone['cell_count']}")
     
     with info_col2:
         st.write("**Échantillon de valeurs:**")
-        sample_values = []
-        for cell in zone['cells'][:5]:
-            if cell.get('value'):
-                sample_values.append(f"• {cell['value']}")
+        # Les 5 premières valeurs non vides, sans copier la liste des cellules
+        sample_values = list(islice((f"• {c['value']}" for c in zone['cells'] if c.get('value')), 5))
         if sample_values:
             st.write("\n".join(sample_values))
         else:
             st.write("(cellules vides)")
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def zone_statistics_pairs(file_hash: str, sheet_name: str, zones_key: tuple, _zones):
+    """
+    Totaux, compteurs de labels par type et tableau par zone
+    Recalculés seulement quand les zones changent (zones_key)
+    """
+    def zone_record(zone):
+        bounds = zone['bounds']
+        zone_label_counts = get_label_counts(zone)
+        return (
+            zone['id'],
+            zone['cell_count'],
+            f"{num_to_excel_col(bounds['min_col'])}{bounds['min_row']} - {num_to_excel_col(bounds['max_col'])}{bounds['max_row']}",
+            zone_label_counts['h1'],
+            zone_label_counts['h2'],
+            zone_label_counts['v1'],
+            zone_label_counts['v2']
+        )
+    
+    # Une seule passe sur les zones, puis agrégats vectorisés sur les colonnes
+    zone_df = pd.DataFrame.from_records(
+        (zone_record(z) for z in _zones),
+        columns=['Zone', 'Cellules', 'Position', 'H1', 'H2', 'V1', 'V2']
+    )
+    type_columns = ['H1', 'H2', 'V1', 'V2']
+    zone_df['Total Labels'] = zone_df[type_columns].sum(axis=1)
+    
+    type_totals = zone_df[type_columns].sum()
+    label_counts = {col.lower(): int(type_totals[col]) for col in type_columns}
+    
+    totals = {
+        'zones': len(zone_df),
+        'cells': int(zone_df['Cellules'].sum()),
+        'labels': int(zone_df['Total Labels'].sum())
+    }
+    return totals, label_counts, zone_df
+
+def label_type_bar_fig(title: str, types, counts, colors):
+    """Barres par type de label, une trace par type (go.Bar direct, sans passer par px/DataFrame)"""
+    fig = go.Figure([
+        go.Bar(name=label_type, x=[label_type], y=[count], marker_color=f"#{color}")
+        for label_type, count, color in zip(types, counts, colors)
+    ])
+    fig.update_layout(title=title, xaxis_title='Type', yaxis_title='Nombre', legend_title_text='Type')
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def label_type_figs_pairs(label_counts_key: tuple, palette_key: str, _palette):
+    """Graphiques H1/H2 et V1/V2, partagés tant que les compteurs et la palette sont inchangés"""
+    label_counts = dict(label_counts_key)
+    
+    # Graphique pour les headers horizontaux
+    fig_h = label_type_bar_fig(
+        "Headers Horizontaux",
+        ['H1', 'H2'],
+        [label_counts['h1'], label_counts['h2']],
+        [_palette['h1_color'], _palette['h2_color']]
+    )
+    
+    # Graphique pour les headers verticaux
+    fig_v = label_type_bar_fig(
+        "Headers Verticaux",
+        ['V1', 'V2'],
+        [label_counts['v1'], label_counts['v2']],
+        [_palette['v1_color'], _palette['v2_color']]
+    )
+    
+    return fig_h, fig_v
+
 def display_statistics_tab_pairs():
     """Affiche les statistiques - Version 4 couleurs"""
-    if not st.session_state.zones:
+    zones = st.session_state.zones
+    palette = st.session_state.color_palette
+    
+    if not zones:
         st.info("Aucune zone détectée pour afficher les statistiques")
         return
     
+    totals, label_counts, zone_df = zone_statistics_pairs(
+        st.session_state.file_hash,
+        st.session_state.current_sheet,
+        tuple(make_zone_key(z) for z in zones),
+        zones
+    )
+    
     # Statistiques globales
     col1, col2, col3, col4 = st.columns(4)
     
-    total_zones = len(st.session_state.zones)
-    total_cells = sum(z['cell_count'] for z in st.session_state.zones)
-    total_labels = sum(len(z.get('labels', [])) for z in st.session_state.zones)
-    
-    col1.metric("📦 Zones", total_zones)
-    col2.metric("📋 Cellules totales", total_cells)
-    col3.metric("🏷️ Labels totaux", total_labels)
+    col1.metric("📦 Zones", totals['zones'])
+    col2.metric("📋 Cellules totales", totals['cells'])
+    col3.metric("🏷️ Labels totaux", totals['labels'])
     col4.metric("🎨 Couleurs configurées", "5")
     
     # Graphiques par type de label
     st.markdown("### 📊 Répartition des labels par type")
     
-    # Compter les labels par type
-    label_counts = {'h1': 0, 'h2': 0, 'v1': 0, 'v2': 0}
-    
-    for zone in st.session_state.zones:
-        for label in zone.get('labels', []):
-            label_type = label.get('type', '')
-            if label_type in label_counts:
-                label_counts[label_type] += 1
+    fig_h, fig_v = label_type_figs_pairs(
+        tuple(sorted(label_counts.items())),
+        make_palette_key(palette),
+        palette
+    )
     
-    # Créer le graphique
     col1, col2 = st.columns(2)
-    
     with col1:
-        # Graphique pour les headers horizontaux
-        h_data = pd.DataFrame({
-            'Type': ['H1', 'H2'],
-            'Nombre': [label_counts['h1'], label_counts['h2']],
-            'Couleur': [st.session_state.color_palette['h1_name'], st.session_state.color_palette['h2_name']]
-        })
-        
-        fig_h = px.bar(h_data, x='Type', y='Nombre', 
-                      title="Headers Horizontaux",
-                      color='Type',
-                      color_discrete_map={
-                          'H1': f"#{st.session_state.color_palette['h1_color']}",
-                          'H2': f"#{st.session_state.color_palette['h2_color']}"
-                      })
         st.plotly_chart(fig_h, use_container_width=True)
-    
     with col2:
-        # Graphique pour les headers verticaux
-        v_data = pd.DataFrame({
-            'Type': ['V1', 'V2'],
-            'Nombre': [label_counts['v1'], label_counts['v2']],
-            'Couleur': [st.session_state.color_palette['v1_name'], st.session_state.color_palette['v2_name']]
-        })
-        
-        fig_v = px.bar(v_data, x='Type', y='Nombre',
-                      title="Headers Verticaux",
-                      color='Type',
-                      color_discrete_map={
-                          'V1': f"#{st.session_state.color_palette['v1_color']}",
-                          'V2': f"#{st.session_state.color_palette['v2_color']}"
-                      })
         st.plotly_chart(fig_v, use_container_width=True)
     
     # Tableau récapitulatif des zones
     st.markdown("### 📋 Détail par zone")
+    st.dataframe(zone_df, use_container_width=True)
     
-    zone_data = []
-    for zone in st.session_state.zones:
-        # Compter les labels par type pour cette zone
-        zone_label_counts = {'h1': 0, 'h2': 0, 'v1': 0, 'v2': 0}
-        for label in zone.get('labels', []):
-            label_type = label.get('type', '')
-            if label_type in zone_label_counts:
-                zone_label_counts[label_type] += 1
-        
-        zone_data.append({
-            'Zone': zone['id'],
-            'Cellules': zone['cell_count'],
-            'Position': f"{num_to_excel_col(zone['bounds']['min_col'])}{zone['bounds']['min_row']} - {num_to_excel_col(zone['bounds']['max_col'])}{zone['bounds']['max_row']}",
-            'H1': zone_label_counts['h1'],
-            'H2': zone_label_counts['h2'],
-            'V1': zone_label_counts['v1'],
-            'V2': zone_label_counts['v2'],
-            'Total Labels': sum(zone_label_counts.values())
-        })
-    
-    st.dataframe(pd.DataFrame(zone_data), use_container_width=True)
-    
-def load_workbook_with_values(file):
+@st.cache_resource(show_spinner=False, max_entries=4)
+def cached_workbook(file_hash: str, filename: str, read_only: bool, _file_bytes: bytes):
+    """
+    Workbook parsé une seule fois par contenu de fichier (file_hash) et par mode
+    Un même fichier rechargé réutilise le workbook sans le reparser
+    """
+    return load_workbook_with_values(BytesIO(_file_bytes), read_only=read_only, filename=filename)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def cached_sheet_values(file_hash: str, sheet_name: str, _workbook):
+    """
+    Valeurs d'une feuille lues une seule fois par contenu de fichier (iter_rows values_only)
+    Tuple de lignes indexé [row - 1][col - 1], partagé par référence : ne pas modifier
+    """
+    return tuple(_workbook[sheet_name].iter_rows(values_only=True))
+
+def sheet_value_grid(values, min_row: int, max_row: int, min_col: int, max_col: int) -> List[List[str]]:
+    """Bloc de valeurs en texte ('' pour une cellule vide), bornes 1-indexées incluses"""
+    return [
+        [value_to_text(v) for v in row[min_col - 1:max_col]]
+        for row in values[min_row - 1:max_row]
+    ]
+
+def open_workbook_read_only(file, file_hash):
+    """
+    Ouvre (une seule fois par fichier) le workbook en mode read_only
+    Le workbook complet précédent est invalidé si le contenu du fichier change
+    """
+    if st.session_state.file_hash == file_hash and st.session_state.workbook_ro is not None:
+        return st.session_state.workbook_ro
+    
+    st.session_state.workbook_ro = cached_workbook(file_hash, file.name, True, st.session_state.file_bytes)
+    st.session_state.workbook = None
+    if st.session_state.file_hash != file_hash:
+        reset_file_state()
+    st.session_state.file_hash = file_hash
+    return st.session_state.workbook_ro
+
+def reset_file_state():
+    """
+    Remet à zéro l'état de session propre au fichier précédent (couleurs, palette, zones)
+    Sans cela, une feuille du même nom reprendrait les cellules colorées de l'ancien fichier,
+    et les totaux et exports globaux incluraient ses feuilles
+    """
+    st.session_state.zones = []
+    st.session_state.current_sheet = None
+    st.session_state.selected_zone = None
+    st.session_state.zone_page = 0
+    st.session_state.all_sheets_zones = {}
+    st.session_state.all_sheets_zones_keys = {}
+    st.session_state.all_sheets_stats = {}
+    st.session_state.color_palette = None
+    st.session_state.label_meta = None
+    st.session_state.label_names = None
+    st.session_state.label_pairs = []
+    st.session_state.global_color_analysis = False
+    st.session_state.detected_colors = []
+    st.session_state.color_cells = {}
+    st.session_state.all_sheets_color_cells = {}
+    st.session_state.color_to_locations = {}
+
+def get_full_workbook(file):
+    """
+    Retourne le workbook complet (styles, cellules fusionnées, accès ws.cell),
+    ouvert à la demande : la détection des couleurs et les vues en ont besoin
+    """
+    if st.session_state.workbook is None:
+        wb_ro = st.session_state.workbook_ro
+        if wb_ro is not None and not getattr(wb_ro, 'read_only', False):
+            # Fichier .xls converti : c'est déjà un workbook complet en mémoire
+            st.session_state.workbook = wb_ro
+        else:
+            st.session_state.workbook = cached_workbook(
+                st.session_state.file_hash, file.name, False, st.session_state.file_bytes
+            )
+    return st.session_state.workbook
+
+def load_workbook_with_values(file, read_only=False, filename=None):
     """
     Charge un fichier Excel avec les valeurs calculées (pas les formules)
+    read_only: mode streaming d'openpyxl pour les fichiers .xlsx (ignoré pour .xls)
+    filename: nom utilisé pour le format quand file n'a pas d'attribut name (BytesIO)
     """
-    import openpyxl
-    import xlrd
-    import tempfile
-    import os
-    
     # Déterminer le type de fichier
-    filename = file.name.lower()
+    filename = (filename or file.name).lower()
     
     if filename.endswith('.xlsx'):
         # Fichier .xlsx - utiliser openpyxl avec data_only=True
-        return openpyxl.load_workbook(file, data_only=True)
+        # keep_links=False : les liens vers des classeurs externes ne sont pas chargés
+        return openpyxl.load_workbook(file, data_only=True, read_only=read_only, keep_links=False)
     
     elif filename.endswith('.xls'):
         # Fichier .xls - xlrd retourne déjà les valeurs calculées
@@ -1505,154 +1764,93 @@ def load_workbook_with_values(file):
 def convert_xls_to_openpyxl_values(file):
     """
     Convertit un fichier .xls en workbook openpyxl avec les valeurs
+    xlrd retourne déjà les valeurs calculées : la conversion d'excel_utils suffit
     """
-    import xlrd
-    import openpyxl
-    
-    # Lire le fichier .xls avec xlrd
-    xls_book = xlrd.open_workbook(file_contents=file.read(), formatting_info=True)
-    
-    # Créer un nouveau workbook openpyxl
-    wb = openpyxl.Workbook()
-    wb.remove(wb.active)  # Supprimer la feuille par défaut
-    
-    # Obtenir les informations de formatage
-    xf_list = xls_book.format_map
-    
-    # Parcourir toutes les feuilles
-    for sheet_idx, sheet_name in enumerate(xls_book.sheet_names()):
-        xls_sheet = xls_book.sheet_by_name(sheet_name)
-        ws = wb.create_sheet(title=sheet_name)
-        
-        # Copier les données et le formatage
-        for row_idx in range(xls_sheet.nrows):
-            for col_idx in range(xls_sheet.ncols):
-                cell = xls_sheet.cell(row_idx, col_idx)
-                
-                # Écrire la valeur (xlrd retourne déjà les valeurs calculées)
-                ws.cell(row=row_idx + 1, column=col_idx + 1, value=cell.value)
-                
-                # Appliquer le formatage si disponible
-                if cell.xf_index is not None and cell.xf_index < len(xf_list):
-                    xf = xf_list[cell.xf_index]
-                    
-                    # Extraire la couleur de fond si elle existe
-                    if xf.background and hasattr(xf.background, 'pattern_colour_index'):
-                        color_idx = xf.background.pattern_colour_index
-                        if color_idx and color_idx < len(xls_book.colour_map):
-                            rgb = xls_book.colour_map.get(color_idx)
-                            if rgb:
-                                # Convertir RGB en hex
-                                hex_color = '%02x%02x%02x' % rgb[:3]
-                                from openpyxl.styles import PatternFill
-                                fill = PatternFill(start_color=hex_color, 
-                                                 end_color=hex_color, 
-                                                 fill_type="solid")
-                                ws.cell(row=row_idx + 1, column=col_idx + 1).fill = fill
-    
-    return wb
+    return convert_xls_to_openpyxl(file)
+
+# Guide d'utilisation (texte statique, construit une seule fois)
+GUIDE_MD = """
+## 🚀 Comment utiliser l'application
+
+### 📋 Concept du système à 4 couleurs
+
+Cette application détecte automatiquement les zones de données et leurs labels associés en utilisant 5 couleurs :
+- 1 couleur pour les zones de données
+- 2 couleurs pour les headers horizontaux (H1, H2)
+- 2 couleurs pour les headers verticaux (V1, V2)
+
+### 1. Structure attendue
+
+```
+[H1] [H1] [H2] [H2] [H1]  <- Headers horizontaux
+[V1] [Z]  [Z]  [Z]  [Z]   <- V1/V2: Headers verticaux, Z: Zones
+[V2] [Z]  [Z]  [Z]  [Z]
+[V1] [Z]  [Z]  [Z]  [Z]
+```
+
+### 2. Logique de détection
+
+Pour chaque cellule de zone :
+- **Verticalement** : Remonte jusqu'au premier header H trouvé, collecte tous les headers de CETTE couleur, s'arrête à l'autre couleur H
+- **Horizontalement** : Recule jusqu'au premier header V trouvé, collecte tous les headers de CETTE couleur, s'arrête à l'autre couleur V
+
+### 3. Étapes d'utilisation
+
+1. **Charger** votre fichier Excel
+2. **Analyser** les couleurs présentes dans tout le fichier
+3. **Configurer** les 5 couleurs (zone + 2H + 2V)
+4. **Traiter** les feuilles (individuellement ou toutes)
+5. **Exporter** les résultats en JSON
+
+### 4. Export
+
+Le JSON exporté contiendra pour chaque cellule de zone :
+- Sa valeur et sa position
+- Tous les headers H de la couleur collectée
+- Tous les headers V de la couleur collectée
+- Structure optimisée pour l'extraction par LLM
+"""
 
 def display_instructions():
     """Affiche les instructions d'utilisation pour le système 4 couleurs"""
     with st.expander("ℹ️ Guide d'utilisation - Système 4 couleurs"):
-        st.markdown("""
-        ## 🚀 Comment utiliser l'application
-        
-        ### 📋 Concept du système à 4 couleurs
-        
-        Cette application détecte automatiquement les zones de données et leurs labels associés en utilisant 5 couleurs :
-        - 1 couleur pour les zones de données
-        - 2 couleurs pour les headers horizontaux (H1, H2)
-        - 2 couleurs pour les headers verticaux (V1, V2)
-        
-        ### 1. Structure attendue
-        
-        ```
-        [H1] [H1] [H2] [H2] [H1]  <- Headers horizontaux
-        [V1] [Z]  [Z]  [Z]  [Z]   <- V1/V2: Headers verticaux, Z: Zones
-        [V2] [Z]  [Z]  [Z]  [Z]
-        [V1] [Z]  [Z]  [Z]  [Z]
-        ```
-        
-        ### 2. Logique de détection
-        
-        Pour chaque cellule de zone :
-        - **Verticalement** : Remonte jusqu'au premier header H trouvé, collecte tous les headers de CETTE couleur, s'arrête à l'autre couleur H
-        - **Horizontalement** : Recule jusqu'au premier header V trouvé, collecte tous les headers de CETTE couleur, s'arrête à l'autre couleur V
-        
-        ### 3. Étapes d'utilisation
-        
-        1. **Charger** votre fichier Excel
-        2. **Analyser** les couleurs présentes dans tout le fichier
-        3. **Configurer** les 5 couleurs (zone + 2H + 2V)
-        4. **Traiter** les feuilles (individuellement ou toutes)
-        5. **Exporter** les résultats en JSON
-        
-        ### 4. Export
-        
-        Le JSON exporté contiendra pour chaque cellule de zone :
-        - Sa valeur et sa position
-        - Tous les headers H de la couleur collectée
-        - Tous les headers V de la couleur collectée
-        - Structure optimisée pour l'extraction par LLM
-        """)
+        st.markdown(GUIDE_MD)
 
 # Fonctions auxiliaires pour l'affichage adapté aux paires
 
-def create_excel_visualization_pairs(workbook, sheet_name, zones, selected_zone, color_palette):
-    """Crée une visualisation adaptée aux paires de labels"""
-    # Utiliser la fonction de base en adaptant le mapping des couleurs
-    adapted_palette = {
+def adapt_palette_for_views(color_palette: Dict) -> Dict:
+    """
+    Palette au format des vues de base (zone_color, zone_name, label_colors)
+    label_colors couvre les types h1..v2 et les types de paires 'h_pair_i' / 'v_pair_i' de zone_detector
+    """
+    label_colors = build_label_meta(color_palette)
+    for i, pair in enumerate(color_palette.get('label_pairs', [])):
+        label_colors[f'h_pair_{i}'] = pair['horizontal']
+        label_colors[f'v_pair_{i}'] = pair['vertical']
+    return {
         'zone_color': color_palette['zone_color'],
         'zone_name': color_palette['zone_name'],
-        'label_colors': {}
+        'label_colors': label_colors
     }
-    
-    # Convertir les paires en format compatible
-    # IMPORTANT: Mapper les types de labels correctement
-    for i, pair in enumerate(color_palette.get('label_pairs', [])):
-        # Les labels ont des types comme 'h_pair_0', 'v_pair_0' dans zone_detector
-        adapted_palette['label_colors'][f'h_pair_{i}'] = pair['horizontal']
-        adapted_palette['label_colors'][f'v_pair_{i}'] = pair['vertical']
-    
-    # Debug
-    print(f"DEBUG visualization: adapted_palette = {adapted_palette}")
-    
-    # Vérifier si on a des labels dans les zones
-    total_labels = sum(len(z.get('labels', [])) for z in zones)
-    print(f"DEBUG visualization: Total labels in zones = {total_labels}")
-    
-    return create_excel_visualization(workbook, sheet_name, zones, selected_zone, adapted_palette)
+
+def create_excel_visualization_pairs(workbook, sheet_name, zones, selected_zone, color_palette):
+    """Crée une visualisation adaptée aux paires de labels"""
+    return create_excel_visualization(workbook, sheet_name, zones, selected_zone,
+                                      adapt_palette_for_views(color_palette))
 
 def create_zone_detail_view_pairs(workbook, sheet_name, zone, color_palette):
     """Crée une vue détaillée adaptée aux paires"""
-    # Adapter le format pour réutiliser la fonction existante
-    adapted_palette = {
-        'zone_color': color_palette['zone_color'],
-        'zone_name': color_palette['zone_name'],
-        'label_colors': {}
-    }
-    
-    # Créer un mapping pour toutes les couleurs de labels
-    for i, pair in enumerate(color_palette.get('label_pairs', [])):
-        adapted_palette['label_colors'][f'h_pair_{i}'] = pair['horizontal']
-        adapted_palette['label_colors'][f'v_pair_{i}'] = pair['vertical']
-    
-    return create_zone_detail_view(workbook, sheet_name, zone, adapted_palette)
+    return create_zone_detail_view(workbook, sheet_name, zone, adapt_palette_for_views(color_palette))
 
-def create_dataframe_view_pairs(workbook, sheet_name: str, zones: List[Dict] = None, 
+def create_dataframe_view_pairs(values, zones: List[Dict] = None, 
                                color_palette: Optional[Dict] = None, max_rows: int = 50) -> pd.DataFrame:
     """
     Crée une vue DataFrame stylée de la feuille Excel avec coloration des zones et paires
+    values : valeurs de la feuille (cached_sheet_values)
     """
-    from utils.excel_utils import num_to_excel_col, excel_col_to_num
-    from utils.color_detector import hex_to_rgb
-    
-    ws = workbook[sheet_name]
-    
     # Limiter les dimensions pour la performance
-    max_row = min(ws.max_row, max_rows)
-    max_col = min(ws.max_column, 26)
+    max_row = min(len(values), max_rows)
+    max_col = min(len(values[0]) if values else 0, 26)
     
     # Créer un mapping des cellules colorées
     colored_cells = {}
@@ -1690,16 +1888,8 @@ def create_dataframe_view_pairs(workbook, sheet_name: str, zones: List[Dict] = N
                     }
     
     # Créer les données du DataFrame
-    data = []
-    columns = [num_to_excel_col(i) for i in range(1, max_col + 1)]
-    
-    for row in range(1, max_row + 1):
-        row_data = []
-        for col in range(1, max_col + 1):
-            cell = ws.cell(row=row, column=col)
-            value = cell.value if cell.value is not None else ""
-            row_data.append(str(value))
-        data.append(row_data)
+    columns = excel_col_names(max_col)[1:max_col + 1]
+    data = sheet_value_grid(values, 1, max_row, 1, max_col)
     
     # Créer le DataFrame
     df = pd.DataFrame(data, columns=columns, index=range(1, max_row + 1))
@@ -1708,37 +1898,36 @@ def create_dataframe_view_pairs(workbook, sheet_name: str, zones: List[Dict] = N
     if not zones or not color_palette:
         return df
     
-    # Appliquer le style avec les couleurs
+    # Matrice de styles calculée une seule fois, en ne visitant que les cellules colorées
+    # Le CSS est construit une fois par (couleur, variante) puis réutilisé
+    style_arr = np.full((max_row, max_col), '', dtype=object)
+    css_cache = {}
+    for (row_num, col_num), cell_info in colored_cells.items():
+        if cell_info['type'] == 'zone':
+            variant = 'zone'
+        elif cell_info.get('direction') == 'horizontal':
+            variant = 'horizontal'
+        else:
+            variant = 'vertical'
+        color = cell_info['color']
+        css = css_cache.get((color, variant))
+        if css is None:
+            # Calculer une couleur de texte contrastante
+            r, g, b, text_color = rgb_and_text_color(color)
+            
+            if variant == 'zone':
+                css = f'background-color: #{color}; color: {text_color}; border: 2px solid #{color};'
+            elif variant == 'horizontal':
+                # Style différencié selon la direction
+                css = f'background-color: #{color}; color: {text_color}; border: 3px solid #{color}; font-weight: bold; text-decoration: underline;'
+            else:
+                css = f'background-color: #{color}; color: {text_color}; border: 3px double #{color}; font-weight: bold; font-style: italic;'
+            css_cache[(color, variant)] = css
+        style_arr[row_num - 1, col_num - 1] = css
+    
     def style_cells(val):
-        """Fonction pour styler les cellules"""
-        from utils.excel_utils import excel_col_to_num
-        from utils.color_detector import hex_to_rgb
-        
-        styles = pd.DataFrame('', index=df.index, columns=df.columns)
-        
-        for row_idx, row_num in enumerate(df.index, 1):
-            for col_idx, col_name in enumerate(df.columns):
-                col_num = excel_col_to_num(col_name)
-                
-                if (row_num, col_num) in colored_cells:
-                    cell_info = colored_cells[(row_num, col_num)]
-                    color = cell_info['color']
-                    
-                    # Calculer une couleur de texte contrastante
-                    r, g, b = hex_to_rgb(color)
-                    brightness = (r * 299 + g * 587 + b * 114) / 1000
-                    text_color = 'white' if brightness < 128 else 'black'
-                    
-                    if cell_info['type'] == 'zone':
-                        styles.iloc[row_idx-1, col_idx] = f'background-color: #{color}; color: {text_color}; border: 2px solid #{color};'
-                    elif cell_info['type'] == 'label':
-                        # Style différencié selon la direction
-                        if cell_info.get('direction') == 'horizontal':
-                            styles.iloc[row_idx-1, col_idx] = f'background-color: #{color}; color: {text_color}; border: 3px solid #{color}; font-weight: bold; text-decoration: underline;'
-                        else:
-                            styles.iloc[row_idx-1, col_idx] = f'background-color: #{color}; color: {text_color}; border: 3px double #{color}; font-weight: bold; font-style: italic;'
-        
-        return styles
+        """Fonction pour styler les cellules (matrice précalculée)"""
+        return pd.DataFrame(style_arr, index=df.index, columns=df.columns)
     
     # Appliquer le style
     try:
@@ -1750,87 +1939,90 @@ def create_dataframe_view_pairs(workbook, sheet_name: str, zones: List[Dict] = N
         print(f"Erreur lors de l'application du style: {e}")
         return df
 
-def create_zone_detail_table_view_pairs(workbook, sheet_name: str, zone: Dict, color_palette: Dict) -> pd.DataFrame:
+def zone_viewport_masks(zone: Dict, min_row: int, max_row: int, min_col: int, max_col: int):
+    """
+    Masques de la fenêtre [min_row..max_row] x [min_col..max_col] d'une vue zone :
+    zone_mask (bool) pour les cellules de la zone, label_idx (indice dans labels, -1 sinon)
+    Retourne (zone_mask, label_idx, labels)
+    """
+    shape = (max(0, max_row - min_row + 1), max(0, max_col - min_col + 1))
+    zone_mask = np.zeros(shape, dtype=bool)
+    label_idx = np.full(shape, -1, dtype=np.int32)
+    
+    for cell in zone['cells']:
+        r, c = cell['row'] - min_row, cell['col'] - min_col
+        if 0 <= r < shape[0] and 0 <= c < shape[1]:
+            zone_mask[r, c] = True
+    
+    labels = zone.get('labels', [])
+    for i, label in enumerate(labels):
+        r, c = label['row'] - min_row, label['col'] - min_col
+        if 0 <= r < shape[0] and 0 <= c < shape[1]:
+            label_idx[r, c] = i
+    
+    return zone_mask, label_idx, labels
+
+def label_pair_color(label: Dict, color_palette: Dict) -> Optional[str]:
+    """Couleur d'un label selon sa paire et sa direction (None si la paire est inconnue)"""
+    label_pairs = color_palette.get('label_pairs', [])
+    if 'pair_id' not in label or label['pair_id'] >= len(label_pairs):
+        return None
+    pair = label_pairs[label['pair_id']]
+    if label.get('direction') == 'horizontal':
+        return pair['horizontal']['color']
+    return pair['vertical']['color']
+
+def create_zone_detail_table_view_pairs(values, zone: Dict, color_palette: Dict) -> pd.DataFrame:
     """
     Crée une vue tableau détaillée pour une zone spécifique avec coloration des paires
+    values : valeurs de la feuille (cached_sheet_values)
     """
-    ws = workbook[sheet_name]
     bounds = zone['bounds']
     
     # Ajouter une marge pour voir les labels autour
     margin = 3
     min_row = max(1, bounds['min_row'] - margin)
-    max_row = min(ws.max_row, bounds['max_row'] + margin)
+    max_row = min(len(values), bounds['max_row'] + margin)
     min_col = max(1, bounds['min_col'] - margin)
-    max_col = min(ws.max_column, bounds['max_col'] + margin)
+    max_col = min(len(values[0]) if values else 0, bounds['max_col'] + margin)
     
-    # Créer un mapping des cellules de la zone et des labels
-    zone_cells = {(c['row'], c['col']) for c in zone['cells']}
-    label_cells = {(l['row'], l['col']): l for l in zone.get('labels', [])}
+    # Masques de la fenêtre : cellules de la zone et indices des labels
+    zone_mask, label_idx, labels = zone_viewport_masks(zone, min_row, max_row, min_col, max_col)
     
     # Créer les données du DataFrame
-    data = []
-    columns = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
-    
-    for row in range(min_row, max_row + 1):
-        row_data = []
-        for col in range(min_col, max_col + 1):
-            cell = ws.cell(row=row, column=col)
-            value = cell.value if cell.value is not None else ""
-            row_data.append(str(value))
-        data.append(row_data)
+    columns = excel_col_names(max_col)[min_col:max_col + 1]
+    data = sheet_value_grid(values, min_row, max_row, min_col, max_col)
     
     # Créer le DataFrame
     df = pd.DataFrame(data, columns=columns, index=range(min_row, max_row + 1))
     
+    # Matrice de styles calculée une seule fois : les labels ne sont stylés que hors zone
+    style_arr = np.full(zone_mask.shape, '', dtype=object)
+    zone_color = color_palette['zone_color']
+    r, g, b, text_color = rgb_and_text_color(zone_color)
+    style_arr[zone_mask] = f'background-color: #{zone_color}; color: {text_color}; font-weight: bold; border: 2px solid #{zone_color};'
+    
+    css_cache = {}
+    for ri, ci in zip(*np.nonzero((label_idx >= 0) & ~zone_mask)):
+        label = labels[label_idx[ri, ci]]
+        label_color = label_pair_color(label, color_palette)
+        if not label_color:
+            continue
+        horizontal = label.get('direction') == 'horizontal'
+        css = css_cache.get((label_color, horizontal))
+        if css is None:
+            r, g, b, text_color = rgb_and_text_color(label_color)
+            # Style différencié selon la direction
+            if horizontal:
+                css = f'background-color: #{label_color}; color: {text_color}; font-weight: bold; border: 3px solid #{label_color}; box-shadow: 0 2px 0 rgba({r},{g},{b},0.7);'
+            else:
+                css = f'background-color: #{label_color}; color: {text_color}; font-weight: bold; border: 3px solid #{label_color}; box-shadow: 2px 0 0 rgba({r},{g},{b},0.7);'
+            css_cache[(label_color, horizontal)] = css
+        style_arr[ri, ci] = css
+    
     def style_zone_cells(val):
-        """Fonction pour styler les cellules de la zone avec paires"""
-        from utils.excel_utils import excel_col_to_num, num_to_excel_col
-        from utils.color_detector import hex_to_rgb
-        
-        styles = pd.DataFrame('', index=df.index, columns=df.columns)
-        
-        for row_idx in range(len(df)):
-            actual_row = df.index[row_idx]
-            
-            for col_idx in range(len(df.columns)):
-                col_name = df.columns[col_idx]
-                col_num = excel_col_to_num(col_name)
-                
-                # Vérifier si c'est une cellule de zone
-                if (actual_row, col_num) in zone_cells:
-                    zone_color = color_palette['zone_color']
-                    r, g, b = hex_to_rgb(zone_color)
-                    brightness = (r * 299 + g * 587 + b * 114) / 1000
-                    text_color = 'white' if brightness < 128 else 'black'
-                    
-                    styles.iloc[row_idx, col_idx] = f'background-color: #{zone_color}; color: {text_color}; font-weight: bold; border: 2px solid #{zone_color};'
-                
-                # Vérifier si c'est un label (priorité sur la zone)
-                elif (actual_row, col_num) in label_cells:
-                    label = label_cells[(actual_row, col_num)]
-                    
-                    # Déterminer la couleur du label selon la paire et la direction
-                    label_color = None
-                    if 'pair_id' in label and label['pair_id'] < len(color_palette.get('label_pairs', [])):
-                        pair = color_palette['label_pairs'][label['pair_id']]
-                        if label.get('direction') == 'horizontal':
-                            label_color = pair['horizontal']['color']
-                        else:
-                            label_color = pair['vertical']['color']
-                    
-                    if label_color:
-                        r, g, b = hex_to_rgb(label_color)
-                        brightness = (r * 299 + g * 587 + b * 114) / 1000
-                        text_color = 'white' if brightness < 128 else 'black'
-                        
-                        # Style différencié selon la direction
-                        if label.get('direction') == 'horizontal':
-                            styles.iloc[row_idx, col_idx] = f'background-color: #{label_color}; color: {text_color}; font-weight: bold; border: 3px solid #{label_color}; box-shadow: 0 2px 0 rgba({r},{g},{b},0.7);'
-                        else:
-                            styles.iloc[row_idx, col_idx] = f'background-color: #{label_color}; color: {text_color}; font-weight: bold; border: 3px solid #{label_color}; box-shadow: 2px 0 0 rgba({r},{g},{b},0.7);'
-        
-        return styles
+        """Fonction pour styler les cellules de la zone avec paires (matrice précalculée)"""
+        return pd.DataFrame(style_arr, index=df.index, columns=df.columns)
 
     # Appliquer le style
     try:
@@ -1842,43 +2034,44 @@ def create_zone_detail_table_view_pairs(workbook, sheet_name: str, zone: Dict, c
         print(f"Erreur lors de l'application du style: {e}")
         return df
 
-def create_zone_detail_table_view_pairs_enhanced(workbook, sheet_name: str, zone: Dict, 
+def create_zone_detail_table_view_pairs_enhanced(values, zone: Dict, 
                                                 color_palette: Dict, show_markers: bool = True) -> pd.DataFrame:
     """
     Version améliorée de la vue tableau avec marqueurs visuels pour les paires
+    values : valeurs de la feuille (cached_sheet_values)
     """
-    ws = workbook[sheet_name]
     bounds = zone['bounds']
     
     # Calculer la zone d'affichage avec marge
     margin = 3
     min_row = max(1, bounds['min_row'] - margin)
-    max_row = min(ws.max_row, bounds['max_row'] + margin)
+    max_row = min(len(values), bounds['max_row'] + margin)
     min_col = max(1, bounds['min_col'] - margin)
-    max_col = min(ws.max_column, bounds['max_col'] + margin)
+    max_col = min(len(values[0]) if values else 0, bounds['max_col'] + margin)
     
-    # Créer les mappings
-    zone_cells = {(c['row'], c['col']) for c in zone['cells']}
-    label_cells = {(l['row'], l['col']): l for l in zone.get('labels', [])}
+    # Masques de la fenêtre : cellules de la zone et indices des labels
+    zone_mask, label_idx, labels = zone_viewport_masks(zone, min_row, max_row, min_col, max_col)
     
     # Créer le DataFrame avec marqueurs visuels
-    columns = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
+    columns = excel_col_names(max_col)[min_col:max_col + 1]
     data = []
     
-    for row in range(min_row, max_row + 1):
+    for ri, row in enumerate(range(min_row, max_row + 1)):
         row_data = []
-        for col in range(min_col, max_col + 1):
-            cell = ws.cell(row=row, column=col)
-            value = cell.value if cell.value is not None else ""
+        row_values = values[row - 1]
+        for ci, col in enumerate(range(min_col, max_col + 1)):
+            value = row_values[col - 1]
+            if value is None:
+                value = ""
             
             # Ajouter des indicateurs visuels dans le texte si activé
             if show_markers:
-                if (row, col) in zone_cells:
+                if zone_mask[ri, ci]:
                     # Cellule de zone
                     value = f"🔵 {value}" if value else "🔵"
-                elif (row, col) in label_cells:
+                elif label_idx[ri, ci] >= 0:
                     # Label - indicateur selon la paire et la direction
-                    label = label_cells[(row, col)]
+                    label = labels[label_idx[ri, ci]]
                     if 'pair_id' in label:
                         pair_num = label['pair_id'] + 1
                         if label.get('direction') == 'horizontal':
@@ -1892,45 +2085,33 @@ def create_zone_detail_table_view_pairs_enhanced(workbook, sheet_name: str, zone
     
     df = pd.DataFrame(data, columns=columns, index=range(min_row, max_row + 1))
     
-    # Style avancé avec CSS
+    # Style avancé avec CSS, matrice calculée une seule fois
+    style_arr = np.full(zone_mask.shape, '', dtype=object)
+    zone_color = color_palette['zone_color']
+    r, g, b = hex_to_rgb(zone_color)
+    style_arr[zone_mask] = f'background-color: rgba({r}, {g}, {b}, 0.3); border: 3px solid #{zone_color}; font-weight: bold; text-align: center;'
+    
+    css_cache = {}
+    for ri, ci in zip(*np.nonzero((label_idx >= 0) & ~zone_mask)):
+        # Style pour labels avec différenciation par paire
+        label = labels[label_idx[ri, ci]]
+        label_color = label_pair_color(label, color_palette)
+        if not label_color:
+            continue
+        horizontal = label.get('direction') == 'horizontal'
+        css = css_cache.get((label_color, horizontal))
+        if css is None:
+            r, g, b = hex_to_rgb(label_color)
+            if horizontal:
+                css = f'background-color: rgba({r}, {g}, {b}, 0.5); border-top: 4px solid #{label_color}; border-bottom: 4px solid #{label_color}; font-weight: bold; text-align: center;'
+            else:
+                css = f'background-color: rgba({r}, {g}, {b}, 0.5); border-left: 4px solid #{label_color}; border-right: 4px solid #{label_color}; font-weight: bold; text-align: center;'
+            css_cache[(label_color, horizontal)] = css
+        style_arr[ri, ci] = css
+    
     def enhanced_style(x):
-        """Style avancé pour le tableau avec paires"""
-        from utils.excel_utils import excel_col_to_num
-        from utils.color_detector import hex_to_rgb
-        
-        styles = pd.DataFrame('', index=df.index, columns=df.columns)
-        
-        for row_idx in range(len(df)):
-            actual_row = df.index[row_idx]
-            
-            for col_idx in range(len(df.columns)):
-                col_name = df.columns[col_idx]
-                col_num = excel_col_to_num(col_name)
-                
-                if (actual_row, col_num) in zone_cells:
-                    # Style pour cellules de zone
-                    zone_color = color_palette['zone_color']
-                    r, g, b = hex_to_rgb(zone_color)
-                    
-                    styles.iloc[row_idx, col_idx] = f'background-color: rgba({r}, {g}, {b}, 0.3); border: 3px solid #{zone_color}; font-weight: bold; text-align: center;'
-                
-                elif (actual_row, col_num) in label_cells:
-                    # Style pour labels avec différenciation par paire
-                    label = label_cells[(actual_row, col_num)]
-                    
-                    if 'pair_id' in label and label['pair_id'] < len(color_palette.get('label_pairs', [])):
-                        pair = color_palette['label_pairs'][label['pair_id']]
-                        
-                        if label.get('direction') == 'horizontal':
-                            label_color = pair['horizontal']['color']
-                            r, g, b = hex_to_rgb(label_color)
-                            styles.iloc[row_idx, col_idx] = f'background-color: rgba({r}, {g}, {b}, 0.5); border-top: 4px solid #{label_color}; border-bottom: 4px solid #{label_color}; font-weight: bold; text-align: center;'
-                        else:
-                            label_color = pair['vertical']['color']
-                            r, g, b = hex_to_rgb(label_color)
-                            styles.iloc[row_idx, col_idx] = f'background-color: rgba({r}, {g}, {b}, 0.5); border-left: 4px solid #{label_color}; border-right: 4px solid #{label_color}; font-weight: bold; text-align: center;'
-        
-        return styles
+        """Style avancé pour le tableau avec paires (matrice précalculée)"""
+        return pd.DataFrame(style_arr, index=df.index, columns=df.columns)
     
     try:
         styled_df = df.style.apply(enhanced_style, axis=None)
@@ -1952,9 +2133,6 @@ def create_zone_detail_table_view_pairs_enhanced(workbook, sheet_name: str, zone
 
 def export_to_json_pairs(zones, sheet_name, color_palette):
     """Exporte les zones avec le système de 4 couleurs en JSON"""
-    import json
-    from datetime import datetime
-    from utils.excel_utils import num_to_excel_col
     
     export_data = {
         "date_export": datetime.now().isoformat(),
@@ -1966,31 +2144,41 @@ def export_to_json_pairs(zones, sheet_name, color_palette):
             "headers": {
                 "horizontal": {
                     "h1": {
-                        "color": f"#{color_palette.get('h1_color', '')}",
-                        "name": color_palette.get('h1_name', 'H1')
+                        "color": f"#{color_palette['h1_color']}",
+                        "name": color_palette['h1_name']
                     },
                     "h2": {
-                        "color": f"#{color_palette.get('h2_color', '')}",
-                        "name": color_palette.get('h2_name', 'H2')
+                        "color": f"#{color_palette['h2_color']}",
+                        "name": color_palette['h2_name']
                     }
                 },
                 "vertical": {
                     "v1": {
-                        "color": f"#{color_palette.get('v1_color', '')}",
-                        "name": color_palette.get('v1_name', 'V1')
+                        "color": f"#{color_palette['v1_color']}",
+                        "name": color_palette['v1_name']
                     },
                     "v2": {
-                        "color": f"#{color_palette.get('v2_color', '')}",
-                        "name": color_palette.get('v2_name', 'V2')
+                        "color": f"#{color_palette['v2_color']}",
+                        "name": color_palette['v2_name']
                     }
                 }
             }
-        },
-        "zones": []
+        }
     }
     
-    # Exporter les zones
+    # Gros exports : écriture incrémentale zone par zone, sans indentation
+    if len(zones) >= COMPACT_JSON_MIN_ZONES:
+        return json_array_to_bytes(export_data, "zones", ([zone_data] for zone_data in iter_zone_exports_pairs(zones)))
+    
+    export_data["zones"] = list(iter_zone_exports_pairs(zones))
+    return json_to_bytes(export_data)
+
+def iter_zone_exports_pairs(zones):
+    """Produit les zones au format d'export JSON, une à la fois"""
     for zone in zones:
+        labels = zone.get('labels', [])
+        # Table des lettres de colonnes couvrant la zone et ses labels
+        col_names = excel_col_names(max(zone['bounds']['max_col'], max((l['col'] for l in labels), default=0)))
         zone_data = {
             "id": zone['id'],
             "bounds": {
@@ -1998,11 +2186,11 @@ def export_to_json_pairs(zones, sheet_name, color_palette):
                 "max_row": zone['bounds']['max_row'],
                 "min_col": zone['bounds']['min_col'],
                 "max_col": zone['bounds']['max_col'],
-                "min_col_letter": num_to_excel_col(zone['bounds']['min_col']),
-                "max_col_letter": num_to_excel_col(zone['bounds']['max_col'])
+                "min_col_letter": col_names[zone['bounds']['min_col']],
+                "max_col_letter": col_names[zone['bounds']['max_col']]
             },
             "cell_count": zone['cell_count'],
-            "cells": format_cells_for_export_pairs(zone['cells']),
+            "cells": format_cells_for_export_pairs(zone['cells'], col_names),
             "labels": {
                 "horizontal": [],
                 "vertical": []
@@ -2010,13 +2198,14 @@ def export_to_json_pairs(zones, sheet_name, color_palette):
         }
         
         # Organiser les labels par direction
-        for label in zone.get('labels', []):
+        for label in labels:
+            col_letter = col_names[label['col']]
             formatted_label = {
-                "address": f"{num_to_excel_col(label['col'])}{label['row']}",
+                "address": f"{col_letter}{label['row']}",
                 "row": label['row'],
                 "col": label['col'],
-                "col_letter": num_to_excel_col(label['col']),
-                "value": str(label.get('value', '')) if label.get('value') is not None else "",
+                "col_letter": col_letter,
+                "value": value_to_text(label.get('value')),
                 "type": label.get('type', ''),
                 "distance": label.get('distance', 0),
                 "color": f"#{label.get('color', '')}"
@@ -2027,41 +2216,44 @@ def export_to_json_pairs(zones, sheet_name, color_palette):
             else:
                 zone_data["labels"]["vertical"].append(formatted_label)
         
-        export_data["zones"].append(zone_data)
-    
-    return json.dumps(export_data, indent=2, ensure_ascii=False)
+        yield zone_data
 
-def format_cells_for_export_pairs(cells):
-    """Formate les cellules pour l'export"""
-    from utils.excel_utils import num_to_excel_col
-    formatted_cells = []
+def format_cells_for_export_pairs(cells, col_names=None):
+    """
+    Formate les cellules pour l'export
+    col_names : table des lettres de colonnes (excel_col_names), calculée si absente
+    """
+    if col_names is None:
+        col_names = excel_col_names(max((cell['col'] for cell in cells), default=0))
     
+    formatted_cells = []
     for cell in cells:
+        col_letter = col_names[cell['col']]
         formatted_cells.append({
-            "address": f"{num_to_excel_col(cell['col'])}{cell['row']}",
+            "address": f"{col_letter}{cell['row']}",
             "row": cell['row'],
             "col": cell['col'],
-            "col_letter": num_to_excel_col(cell['col']),
-            "value": str(cell.get('value', '')) if cell.get('value') is not None else ""
+            "col_letter": col_letter,
+            "value": value_to_text(cell.get('value'))
         })
     
     return formatted_cells
 
 def format_labels_by_pair(labels):
     """Organise les labels par paire pour l'export"""
-    from utils.excel_utils import num_to_excel_col
-    from collections import defaultdict
     
     labels_by_pair = defaultdict(lambda: {"horizontal": [], "vertical": []})
+    col_names = excel_col_names(max((label['col'] for label in labels), default=0))
     
     for label in labels:
         if 'pair_id' in label:
+            col_letter = col_names[label['col']]
             formatted_label = {
-                "address": f"{num_to_excel_col(label['col'])}{label['row']}",
+                "address": f"{col_letter}{label['row']}",
                 "row": label['row'],
                 "col": label['col'],
-                "col_letter": num_to_excel_col(label['col']),
-                "value": str(label.get('value', '')) if label.get('value') is not None else "",
+                "col_letter": col_letter,
+                "value": value_to_text(label.get('value')),
                 "distance": label.get('distance', 0),
                 "position": label.get('position', ''),
                 "pair_name": label.get('pair_name', '')
@@ -3,17 +3,27 @@ Module de détection et d'analyse des couleurs dans les fichiers Excel
 """
 
 import colorsys
+from functools import lru_cache
 from collections import defaultdict, Counter
 from typing import List, Dict, Tuple
 from .excel_utils import get_cell_color, num_to_excel_col, get_cell_value, rgb_to_hex, get_merged_cells_info
 
+@lru_cache(maxsize=256)
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
-    """Convertit hexadécimal en RGB"""
+    """Convertit hexadécimal en RGB (mémoïsé : une palette compte peu de couleurs)"""
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+@lru_cache(maxsize=256)
+def rgb_and_text_color(hex_color: str) -> Tuple[int, int, int, str]:
+    """RGB d'une couleur de fond et couleur de texte contrastante ('white' ou 'black')"""
+    r, g, b = hex_to_rgb(hex_color)
+    brightness = (r * 299 + g * 587 + b * 114) / 1000
+    return r, g, b, 'white' if brightness < 128 else 'black'
+
+@lru_cache(maxsize=4096)
 def get_color_name(hex_color: str) -> str:
-    """Retourne un nom descriptif pour une couleur"""
+    """Retourne un nom descriptif pour une couleur (mémoïsé : fonction pure)"""
     try:
         r, g, b = hex_to_rgb(hex_color)
         h, s, v = colorsys.rgb_to_hsv(r/255, g/255, b/255)
@@ -59,6 +69,34 @@ def get_color_name(hex_color: str) -> str:
     except:
         return "Inconnu"
 
+def get_cell_fill_id(cell):
+    """
+    Identifiant du remplissage d'une cellule dans la table des styles du classeur
+    (cellules normales et ReadOnlyCell), None si la cellule n'a pas de style (EmptyCell)
+    """
+    style = getattr(cell, 'style_array', None)  # ReadOnlyCell
+    if style is None:
+        style = getattr(cell, '_style', None)  # Cell / MergedCell
+    return getattr(style, 'fillId', None)
+
+def normalize_fill_color(hex_color):
+    """Code RGB majuscule d'une couleur de remplissage, None si absente ou (presque) blanche"""
+    if not hex_color or hex_color in ("FFFFFF", "00000000"):
+        return None
+    
+    # Nettoyer le code couleur
+    hex_color = hex_color.upper().lstrip('#')
+    if len(hex_color) == 8:  # ARGB
+        hex_color = hex_color[2:]  # Enlever le canal alpha
+    if len(hex_color) != 6:  # RGB invalide
+        return None
+    
+    # Vérifier si c'est vraiment blanc (tolérance pour les blancs cassés)
+    r, g, b = hex_to_rgb(hex_color)
+    if r > 250 and g > 250 and b > 250:
+        return None
+    return hex_color
+
 def detect_all_colors(workbook, sheet_name: str) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
     """
     Détecte toutes les couleurs présentes dans la feuille Excel
@@ -68,55 +106,52 @@ def detect_all_colors(workbook, sheet_name: str) -> Tuple[List[Dict], Dict[str,
     color_cells = defaultdict(list)
     color_counts = Counter()
     
-    # Obtenir les informations sur les cellules fusionnées
+    # Obtenir les informations sur les cellules fusionnées (vides en mode read_only, où openpyxl ne lit pas les fusions)
     merged_info = get_merged_cells_info(ws)
     
     # Debug: compter les cellules analysées
     total_cells = 0
     cells_with_fill = 0
     
-    # Parcourir toutes les cellules
-    for row_idx, row in enumerate(ws.iter_rows()):
-        for col_idx, cell in enumerate(row):
+    # Couleur normalisée par identifiant de remplissage : les cellules d'un même style
+    # partagent leur remplissage, qui n'est donc analysé qu'une fois par feuille
+    colors_by_fill = {}
+    
+    # Parcourir toutes les cellules en un seul passage (compatible avec un workbook read_only,
+    # dont les feuilles ne se lisent qu'en itération séquentielle)
+    for row in ws.iter_rows():
+        for cell in row:
             total_cells += 1
             
-            # Vérifier différentes propriétés de remplissage
-            hex_color = None
+            fill_id = get_cell_fill_id(cell)
+            if fill_id is None:
+                hex_color = normalize_fill_color(get_cell_color(cell))
+            elif fill_id in colors_by_fill:
+                hex_color = colors_by_fill[fill_id]
+            else:
+                hex_color = colors_by_fill[fill_id] = normalize_fill_color(get_cell_color(cell))
             
-            # Méthode 1: utiliser get_cell_color qui gère plus de cas
-            hex_color = get_cell_color(cell)
+            # Ignorer les cellules sans couleur, transparentes ou blanches
+            if not hex_color:
+                if fill_id:  # Remplissage présent mais sans couleur exploitable
+                    cells_with_fill += 1
+                continue
             
-            # Si on n'a pas trouvé avec get_cell_color, essayer d'autres méthodes
-            if not hex_color and hasattr(cell, 'fill') and cell.fill:
-                cells_with_fill += 1
+            # Vérifier si la cellule fait partie d'une fusion
+            merge_data = merged_info.get((cell.row, cell.column), {})
             
-            # Ignorer les cellules sans couleur, transparentes ou blanches
-            if hex_color and hex_color not in ["FFFFFF", "00000000", None, ""]:
-                # Nettoyer le code couleur
-                hex_color = hex_color.upper().lstrip('#')
-                if len(hex_color) == 8:  # ARGB
-                    hex_color = hex_color[2:]  # Enlever le canal alpha
-                if len(hex_color) == 6:  # RGB valide
-                    # Vérifier si c'est vraiment blanc (tolérance pour les blancs cassés)
-                    r, g, b = hex_to_rgb(hex_color)
-                    if r > 250 and g > 250 and b > 250:  # Blanc ou presque blanc
-                        continue
-                    
-                    # Vérifier si la cellule fait partie d'une fusion
-                    merge_data = merged_info.get((cell.row, cell.column), {})
-                    
-                    cell_info = {
-                        'row': cell.row,
-                        'col': cell.column,
-                        'value': get_cell_value(cell),
-                        'address': f"{num_to_excel_col(cell.column)}{cell.row}",
-                        'color': hex_color,
-                        'is_merged': bool(merge_data),
-                        'merge_info': merge_data
-                    }
-                    
-                    color_cells[hex_color].append(cell_info)
-                    color_counts[hex_color] += 1
+            cell_info = {
+                'row': cell.row,
+                'col': cell.column,
+                'value': get_cell_value(cell),
+                'address': f"{num_to_excel_col(cell.column)}{cell.row}",
+                'color': hex_color,
+                'is_merged': bool(merge_data),
+                'merge_info': merge_data
+            }
+            
+            color_cells[hex_color].append(cell_info)
+            color_counts[hex_color] += 1
     
     print(f"Debug - Cellules analysées: {total_cells}, avec fill: {cells_with_fill}, avec couleur: {sum(color_counts.values())}")
     print(f"Debug - Couleurs trouvées: {list(color_counts.keys())}")
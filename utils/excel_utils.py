@@ -5,14 +5,13 @@ Version corrigée pour mieux détecter les couleurs
 
 import openpyxl
 import xlrd
+from openpyxl.styles import PatternFill
 import tempfile
 import os
 from typing import Union, List, Tuple, Any, Dict
 
-def num_to_excel_col(n: int) -> str:
-    """Convertit un numéro de colonne en lettre Excel"""
-    if n <= 0:
-        return "?"
+def _compute_excel_col(n: int) -> str:
+    """Calcule la lettre Excel d'un numéro de colonne (n >= 1)"""
     col = ""
     while n > 0:
         n -= 1
@@ -20,6 +19,23 @@ def num_to_excel_col(n: int) -> str:
         n //= 26
     return col
 
+# Table des noms de colonnes précalculée : COL_NAMES[n] pour n de 1 à 702 (A..ZZ), index 0 inutilisé
+COL_NAMES = [''] + [_compute_excel_col(n) for n in range(1, 26 * 27 + 1)]
+
+def num_to_excel_col(n: int) -> str:
+    """Convertit un numéro de colonne en lettre Excel"""
+    if n <= 0:
+        return "?"
+    if n < len(COL_NAMES):
+        return COL_NAMES[n]
+    return _compute_excel_col(n)
+
+def excel_col_names(max_col: int) -> List[str]:
+    """Table des noms de colonnes indexée par numéro (index 0 vide), jusqu'à max_col inclus"""
+    if max_col < len(COL_NAMES):
+        return COL_NAMES
+    return COL_NAMES + [_compute_excel_col(n) for n in range(len(COL_NAMES), max_col + 1)]
+
 def excel_col_to_num(col_str: str) -> int:
     """Convertit une lettre de colonne Excel en numéro"""
     num = 0
@@ -27,17 +43,18 @@ def excel_col_to_num(col_str: str) -> int:
         num = num * 26 + (ord(char.upper()) - ord('A') + 1)
     return num
 
-def load_workbook(file, data_only=False):
+def load_workbook(file, data_only=False, read_only=False):
     """
     Charge un fichier Excel (.xlsx ou .xls)
     Retourne un workbook openpyxl
+    read_only: mode streaming d'openpyxl (pas de DOM complet, pas d'accès aléatoire)
     """
     # Déterminer le type de fichier
     filename = file.name.lower()
     
     if filename.endswith('.xlsx'):
         # Fichier .xlsx - utiliser openpyxl directement
-        return openpyxl.load_workbook(file, data_only=data_only)
+        return openpyxl.load_workbook(file, data_only=data_only, read_only=read_only, keep_links=False)
     
     elif filename.endswith('.xls'):
         # Fichier .xls - convertir via xlrd
@@ -58,39 +75,44 @@ def convert_xls_to_openpyxl(file):
     wb = openpyxl.Workbook()
     wb.remove(wb.active)  # Supprimer la feuille par défaut
     
-    # Obtenir les informations de formatage
-    xf_list = xls_book.format_map
+    # Remplissage par format (xf), calculé une seule fois pour le classeur
+    # Seuls les formats avec une couleur de fond connue sont retenus
+    # Un seul PatternFill par couleur de la palette, partagé par les formats qui l'utilisent
+    fill_by_color = {}
+    fill_by_xf = {}
+    for xf_index, xf in enumerate(xls_book.xf_list):
+        background = getattr(xf, 'background', None)
+        color_idx = getattr(background, 'pattern_colour_index', None)
+        if not color_idx:
+            continue
+        fill = fill_by_color.get(color_idx)
+        if fill is None:
+            rgb = xls_book.colour_map.get(color_idx)
+            if not rgb:
+                continue
+            # Convertir RGB en hex
+            hex_color = '%02x%02x%02x' % rgb[:3]
+            fill = fill_by_color[color_idx] = PatternFill(start_color=hex_color,
+                                                          end_color=hex_color,
+                                                          fill_type="solid")
+        fill_by_xf[xf_index] = fill
     
     # Parcourir toutes les feuilles
-    for sheet_idx, sheet_name in enumerate(xls_book.sheet_names()):
+    for sheet_name in xls_book.sheet_names():
         xls_sheet = xls_book.sheet_by_name(sheet_name)
         ws = wb.create_sheet(title=sheet_name)
         
-        # Copier les données et le formatage
+        # Copier les données ligne par ligne
         for row_idx in range(xls_sheet.nrows):
-            for col_idx in range(xls_sheet.ncols):
-                cell = xls_sheet.cell(row_idx, col_idx)
-                
-                # Écrire la valeur
-                ws.cell(row=row_idx + 1, column=col_idx + 1, value=cell.value)
-                
-                # Appliquer le formatage si disponible
-                if cell.xf_index is not None and cell.xf_index < len(xf_list):
-                    xf = xf_list[cell.xf_index]
-                    
-                    # Extraire la couleur de fond si elle existe
-                    if xf.background and hasattr(xf.background, 'pattern_colour_index'):
-                        color_idx = xf.background.pattern_colour_index
-                        if color_idx and color_idx < len(xls_book.colour_map):
-                            rgb = xls_book.colour_map.get(color_idx)
-                            if rgb:
-                                # Convertir RGB en hex
-                                hex_color = '%02x%02x%02x' % rgb[:3]
-                                from openpyxl.styles import PatternFill
-                                fill = PatternFill(start_color=hex_color, 
-                                                 end_color=hex_color, 
-                                                 fill_type="solid")
-                                ws.cell(row=row_idx + 1, column=col_idx + 1).fill = fill
+            ws.append(xls_sheet.row_values(row_idx))
+        
+        # Appliquer le fond uniquement aux cellules dont le format en porte un
+        if fill_by_xf:
+            for row_idx in range(xls_sheet.nrows):
+                for col_idx, cell in enumerate(xls_sheet.row(row_idx)):
+                    fill = fill_by_xf.get(cell.xf_index)
+                    if fill is not None:
+                        ws.cell(row=row_idx + 1, column=col_idx + 1).fill = fill
     
     return wb
 
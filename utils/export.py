@@ -2,10 +2,74 @@
 Module d'export des données en JSON
 """
 
+import csv
+import io
 import json
 from datetime import datetime
-from typing import List, Dict
-from .excel_utils import num_to_excel_col
+from typing import List, Dict, Iterable
+from .excel_utils import num_to_excel_col, excel_col_names
+
+# orjson (facultatif) sérialise plusieurs fois plus vite que le module json standard
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def value_to_text(value) -> str:
+    """Valeur de cellule en texte pour l'export : '' si vide, sans appel à str() pour les chaînes"""
+    if value is None:
+        return ""
+    if value.__class__ is str:
+        return value
+    return str(value)
+
+# Au-delà de ce nombre de zones, l'export JSON est écrit sans indentation (taille divisée par ~2)
+COMPACT_JSON_MIN_ZONES = 500
+
+def json_to_bytes(data: Dict, compact: bool = False) -> bytes:
+    """
+    Sérialise en JSON UTF-8 directement dans un tampon d'octets
+    Évite de matérialiser une chaîne intermédiaire puis sa version encodée
+    Utilise orjson s'il est installé (même format de sortie), sinon le module json
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+        except (orjson.JSONEncodeError, TypeError):
+            pass  # Types non gérés par orjson (ex: entiers > 64 bits) : repli sur json
+    
+    buf = io.BytesIO()
+    writer = io.TextIOWrapper(buf, encoding='utf-8', write_through=True)
+    if compact:
+        json.dump(data, writer, ensure_ascii=False, separators=(',', ':'))
+    else:
+        json.dump(data, writer, ensure_ascii=False, indent=2)
+    writer.detach()  # Ne pas fermer le tampon avec l'enveloppe texte
+    return buf.getvalue()
+
+def json_array_to_bytes(header: Dict, key: str, chunks: Iterable[List]) -> bytes:
+    """
+    Écrit {**header, key: [...]} en JSON compact, de façon incrémentale
+    Les éléments du tableau arrivent par lots (une zone, une feuille...) : seul le lot
+    en cours est gardé en mémoire sous forme d'objets Python
+    """
+    buf = io.BytesIO()
+    buf.write(json_to_bytes(header, compact=True)[:-1])  # En-tête sans l'accolade fermante
+    if header:
+        buf.write(b',')
+    buf.write(json_to_bytes(key, compact=True) + b':[')
+    
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if not first:
+            buf.write(b',')
+        buf.write(json_to_bytes(chunk, compact=True)[1:-1])  # Éléments sans les crochets
+        first = False
+    
+    buf.write(b']}')
+    return buf.getvalue()
 
 def export_to_json(zones: List[Dict], sheet_name: str, color_palette: Dict) -> str:
     """
@@ -62,14 +126,16 @@ def format_cells_for_export(cells: List[Dict]) -> List[Dict]:
     """
     Formate les cellules pour l'export JSON
     """
+    col_names = excel_col_names(max((cell['col'] for cell in cells), default=0))
     formatted_cells = []
     for cell in cells:
+        col_letter = col_names[cell['col']]
         formatted_cells.append({
-            "address": f"{num_to_excel_col(cell['col'])}{cell['row']}",
+            "address": f"{col_letter}{cell['row']}",
             "row": cell['row'],
             "col": cell['col'],
-            "col_letter": num_to_excel_col(cell['col']),
-            "value": str(cell['value']) if cell['value'] is not None else ""
+            "col_letter": col_letter,
+            "value": value_to_text(cell['value'])
         })
     return formatted_cells
 
@@ -77,13 +143,15 @@ def format_labels_for_export(labels: List[Dict]) -> List[Dict]:
     """
     Formate les labels pour l'export JSON
     """
+    col_names = excel_col_names(max((label['col'] for label in labels), default=0))
     formatted_labels = []
     for label in labels:
+        col_letter = col_names[label['col']]
         formatted_labels.append({
-            "address": f"{num_to_excel_col(label['col'])}{label['row']}",
+            "address": f"{col_letter}{label['row']}",
             "row": label['row'],
             "col": label['col'],
-            "col_letter": num_to_excel_col(label['col']),
+            "col_letter": col_letter,
             "value": str(label['value']) if label['value'] is not None else "",
             "type": label['type'],
             "position": label['position']
@@ -94,9 +162,6 @@ def export_to_csv(zones: List[Dict]) -> str:
     """
     Exporte les zones en format CSV pour analyse
     """
-    import csv
-    import io
-    
     output = io.StringIO()
     writer = csv.writer(output)
     
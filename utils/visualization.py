@@ -4,9 +4,44 @@ Module de visualisation pour l'affichage des feuilles Excel et des zones
 
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 from typing import List, Dict, Optional
 from .excel_utils import num_to_excel_col, get_cell_color
-from .color_detector import hex_to_rgb
+from .color_detector import hex_to_rgb, rgb_and_text_color
+
+def _discrete_colorscale(colors: List[str]) -> List[List]:
+    """
+    Colorscale Plotly en paliers : avec zmin=-0.5 et zmax=len(colors)-0.5,
+    la valeur entière i d'une heatmap prend exactement la couleur colors[i]
+    """
+    n = len(colors)
+    scale = []
+    for i, color in enumerate(colors):
+        scale.append([i / n, color])
+        scale.append([(i + 1) / n, color])
+    return scale
+
+def _category_heatmap(categories: np.ndarray, category_colors: List[str], x_coords, y_coords,
+                      text_values, customdata, hovertemplate: str, font_size: int) -> go.Heatmap:
+    """
+    Heatmap unique encodant toutes les cellules colorées (0 = vide, i = category_colors[i])
+    Remplace un shape Plotly par cellule
+    """
+    return go.Heatmap(
+        z=categories,
+        x=x_coords,
+        y=y_coords,
+        showscale=False,
+        hoverongaps=False,
+        colorscale=_discrete_colorscale(category_colors),
+        zmin=-0.5,
+        zmax=len(category_colors) - 0.5,
+        text=text_values,
+        texttemplate="%{text}",
+        textfont={"size": font_size},
+        customdata=customdata,
+        hovertemplate=hovertemplate
+    )
 
 def create_color_detection_preview(workbook, sheet_name: str, color_cells: Dict) -> go.Figure:
     """
@@ -77,17 +112,19 @@ def create_zone_summary_dataframe(zones: List[Dict]) -> pd.DataFrame:
     if not zones:
         return pd.DataFrame()
     
-    data = []
-    for zone in zones:
-        data.append({
-            'Zone ID': zone['id'],
-            'Lignes': f"{zone['bounds']['min_row']}-{zone['bounds']['max_row']}",
-            'Colonnes': f"{num_to_excel_col(zone['bounds']['min_col'])}-{num_to_excel_col(zone['bounds']['max_col'])}",
-            'Nombre de cellules': zone['cell_count'],
-            'Nombre de labels': len(zone.get('labels', []))
-        })
-    
-    return pd.DataFrame(data)
+    return pd.DataFrame.from_records(
+        (
+            (
+                zone['id'],
+                f"{zone['bounds']['min_row']}-{zone['bounds']['max_row']}",
+                f"{num_to_excel_col(zone['bounds']['min_col'])}-{num_to_excel_col(zone['bounds']['max_col'])}",
+                zone['cell_count'],
+                len(zone.get('labels', []))
+            )
+            for zone in zones
+        ),
+        columns=['Zone ID', 'Lignes', 'Colonnes', 'Nombre de cellules', 'Nombre de labels']
+    )
 
 def create_excel_visualization(workbook, sheet_name: str, zones: List[Dict] = None, 
                                    selected_zone: Optional[int] = None, 
@@ -104,21 +141,17 @@ def create_excel_visualization(workbook, sheet_name: str, zones: List[Dict] = No
     print(f"DEBUG: Dimensions affichées: {max_row} x {max_col}")
     
     # Créer les données pour la heatmap
-    z_values = []
     text_values = []
     
     # Préparer les données pour l'affichage
     for row in range(1, max_row + 1):
-        row_values = []
         row_text = []
         
         for col in range(1, max_col + 1):
             cell = ws.cell(row=row, column=col)
             value = cell.value if cell.value is not None else ""
             row_text.append(str(value))
-            row_values.append(1)  # Valeur uniforme pour la heatmap
         
-        z_values.append(row_values)
         text_values.append(row_text)
     
     # Créer les labels pour les axes - UTILISER DES INDICES NUMÉRIQUES
@@ -134,30 +167,31 @@ def create_excel_visualization(workbook, sheet_name: str, zones: List[Dict] = No
     print(f"DEBUG: x_labels: {x_labels[:5]}...")
     print(f"DEBUG: y_labels: {y_labels[:5]}...")
     
-    # Créer la figure Plotly
-    fig = go.Figure()
-    
-    # Ajouter la heatmap de base avec les COORDONNÉES NUMÉRIQUES
-    fig.add_trace(go.Heatmap(
-        z=z_values,
-        x=x_coords,  # CHANGEMENT: utiliser des indices numériques
-        y=y_coords,  # CHANGEMENT: utiliser des indices numériques
-        showscale=False,
-        hoverongaps=False,
-        colorscale=[[0, 'white'], [1, 'white']],
-        text=text_values,
-        texttemplate="%{text}",
-        textfont={"size": 10},
-        #hovertemplate='Cellule: %{x}%{y}<br>Valeur: %{text}<extra></extra>',
-        customdata=[[f"{x_labels[j]}{y_labels[i]}" for j in range(max_col)] for i in range(max_row)],
-        hovertemplate='Cellule: %{customdata}<br>Valeur: %{text}<extra></extra>'
-    ))
-    
-    # Ajouter les rectangles colorés pour les zones avec COORDONNÉES ALIGNÉES
-    shapes = []
+    # Matrice de catégories : 0 = cellule vide, puis une catégorie par couleur affichée
+    categories = np.zeros((max_row, max_col), dtype=np.int16)
+    category_colors = ['white']
+    category_index = {}
+    
+    def get_category(css_color: str) -> int:
+        if css_color not in category_index:
+            category_index[css_color] = len(category_colors)
+            category_colors.append(css_color)
+        return category_index[css_color]
+    
+    # Contours des zones regroupés dans une seule trace (séparés par None)
+    outline_x = []
+    outline_y = []
+    outline_color = None
     annotations = []
     
     if zones and color_mapping:
+        # Couleur de la zone
+        zone_hex = color_mapping['zone_color']
+        r, g, b = hex_to_rgb(zone_hex)
+        outline_color = f'rgb({r}, {g}, {b})'
+        zone_category = get_category(f'rgba({r}, {g}, {b}, 0.3)')
+        selected_category = get_category('rgba(0, 104, 201, 0.5)')
+        
         for zone in zones:
             bounds = zone['bounds']
             
@@ -178,23 +212,16 @@ def create_excel_visualization(workbook, sheet_name: str, zones: List[Dict] = No
             print(f"  Excel bounds: cols {bounds['min_col']}-{bounds['max_col']}, rows {bounds['min_row']}-{bounds['max_row']}")
             print(f"  Plot coords: cols {plot_min_col}-{plot_max_col}, rows {plot_min_row}-{plot_max_row}")
             
-            # Couleur de la zone
-            zone_hex = color_mapping['zone_color']
-            r, g, b = hex_to_rgb(zone_hex)
-            zone_color = f'rgba({r}, {g}, {b}, 0.3)' if zone['id'] != selected_zone else 'rgba(0, 104, 201, 0.5)'
+            # Remplissage du rectangle de la zone (tronqué à la vue)
+            categories[max(plot_min_row, 0):plot_max_row + 1, max(plot_min_col, 0):plot_max_col + 1] = (
+                selected_category if zone['id'] == selected_zone else zone_category
+            )
             
-            # COORDONNÉES CORRIGÉES POUR LES RECTANGLES
-            # Ajouter une marge de 0.5 pour bien centrer sur les cellules
-            shapes.append(dict(
-                type="rect",
-                x0=plot_min_col - 0.5,   # CHANGEMENT: coordonnées alignées
-                y0=plot_min_row - 0.5,   # CHANGEMENT: coordonnées alignées  
-                x1=plot_max_col + 0.5,   # CHANGEMENT: coordonnées alignées
-                y1=plot_max_row + 0.5,   # CHANGEMENT: coordonnées alignées
-                line=dict(color=zone_color, width=2),
-                fillcolor=zone_color,
-                layer="below"
-            ))
+            # Contour : rectangle fermé puis None pour couper la ligne
+            x0, x1 = plot_min_col - 0.5, plot_max_col + 0.5
+            y0, y1 = plot_min_row - 0.5, plot_max_row + 0.5
+            outline_x.extend([x0, x1, x1, x0, x0, None])
+            outline_y.extend([y0, y0, y1, y1, y0, None])
             
             # ANNOTATION AVEC COORDONNÉES CORRIGÉES
             annotations.append(dict(
@@ -208,7 +235,7 @@ def create_excel_visualization(workbook, sheet_name: str, zones: List[Dict] = No
                 font=dict(size=10)
             ))
             
-            # Ajouter des indicateurs pour les labels avec COORDONNÉES CORRIGÉES
+            # Ajouter les labels dans la matrice (par-dessus les zones)
             for label in zone.get('labels', []):
                 # Vérifier que le label est dans les limites d'affichage
                 if label['row'] > max_row or label['col'] > max_col:
@@ -224,24 +251,35 @@ def create_excel_visualization(workbook, sheet_name: str, zones: List[Dict] = No
                     label_color = color_mapping['label2_color']
                 
                 r, g, b = hex_to_rgb(label_color)
-                
-                # COORDONNÉES CORRIGÉES POUR LES LABELS
-                plot_label_col = label['col'] - 1  # Convertir en 0-based
-                plot_label_row = label['row'] - 1  # Convertir en 0-based
-                
-                shapes.append(dict(
-                    type="rect",
-                    x0=plot_label_col - 0.4,  # CHANGEMENT: coordonnée alignée
-                    y0=plot_label_row - 0.4,  # CHANGEMENT: coordonnée alignée
-                    x1=plot_label_col + 0.4,  # CHANGEMENT: coordonnée alignée
-                    y1=plot_label_row + 0.4,  # CHANGEMENT: coordonnée alignée
-                    line=dict(color=f'rgb({r}, {g}, {b})', width=2),
-                    fillcolor=f'rgba({r}, {g}, {b}, 0.7)',
-                ))
+                categories[label['row'] - 1, label['col'] - 1] = get_category(f'rgba({r}, {g}, {b}, 0.7)')
+    
+    # Créer la figure Plotly
+    fig = go.Figure()
+    
+    # Une seule heatmap pour le texte et toutes les cellules colorées (COORDONNÉES NUMÉRIQUES)
+    fig.add_trace(_category_heatmap(
+        categories,
+        category_colors,
+        x_coords,
+        y_coords,
+        text_values,
+        [[f"{x_labels[j]}{y_labels[i]}" for j in range(max_col)] for i in range(max_row)],
+        'Cellule: %{customdata}<br>Valeur: %{text}<extra></extra>',
+        10
+    ))
+    
+    if outline_x:
+        fig.add_trace(go.Scatter(
+            x=outline_x,
+            y=outline_y,
+            mode='lines',
+            line=dict(color=outline_color, width=2),
+            hoverinfo='skip',
+            showlegend=False
+        ))
     
     # CONFIGURATION DES AXES CORRIGÉE
     fig.update_layout(
-        shapes=shapes,
         annotations=annotations,
         xaxis=dict(
             title="Colonnes",
@@ -347,24 +385,23 @@ def create_zone_detail_view(workbook, sheet_name: str, zone: Dict, color_mapping
     print(f"DEBUG Zone detail: Excel range rows {min_row}-{max_row}, cols {min_col}-{max_col}")
     
     # Créer les données pour la heatmap
-    z_values = []
     text_values = []
     customdata = []
     
+    # Lettres des colonnes affichées, calculées une seule fois
+    col_letters = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
+    
     # Préparer les données pour l'affichage
     for row in range(min_row, max_row + 1):
-        row_values = []
         row_text = []
         row_custom = []
         
-        for col in range(min_col, max_col + 1):
+        for col, col_letter in zip(range(min_col, max_col + 1), col_letters):
             cell = ws.cell(row=row, column=col)
             value = cell.value if cell.value is not None else ""
             row_text.append(str(value))
-            row_values.append(1)  # Valeur uniforme pour la heatmap
-            row_custom.append(f"{num_to_excel_col(col)}{row}")  # Référence Excel
+            row_custom.append(f"{col_letter}{row}")  # Référence Excel
         
-        z_values.append(row_values)
         text_values.append(row_text)
         customdata.append(row_custom)
     
@@ -373,7 +410,7 @@ def create_zone_detail_view(workbook, sheet_name: str, zone: Dict, color_mapping
     num_cols = max_col - min_col + 1
     
     # Créer les labels pour les axes
-    x_labels = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
+    x_labels = col_letters
     y_labels = [str(i) for i in range(min_row, max_row + 1)]
     
     # Coordonnées numériques pour Plotly
@@ -384,83 +421,63 @@ def create_zone_detail_view(workbook, sheet_name: str, zone: Dict, color_mapping
     print(f"DEBUG: x_labels: {x_labels}")
     print(f"DEBUG: y_labels: {y_labels}")
     
-    # Créer la figure
-    fig = go.Figure()
-    
-    # Ajouter la heatmap de base avec le texte
-    fig.add_trace(go.Heatmap(
-        z=z_values,
-        x=x_coords,  # Coordonnées numériques
-        y=y_coords,  # Coordonnées numériques
-        showscale=False,
-        text=text_values,
-        texttemplate="%{text}",
-        textfont={"size": 12},
-        customdata=customdata,
-        hovertemplate='%{customdata}: %{text}<extra></extra>',
-        colorscale=[[0, 'white'], [1, 'white']],
-        zmin=0,
-        zmax=1
-    ))
-    
     # Créer un mapping des cellules de la zone et des labels
     zone_cells = {(c['row'], c['col']) for c in zone['cells']}
     label_cells = {(l['row'], l['col']): l for l in zone.get('labels', [])}
     
-    # Ajouter les rectangles colorés avec coordonnées corrigées
-    shapes = []
+    # Matrice de catégories : 0 = cellule vide, puis une catégorie par couleur affichée
+    categories = np.zeros((num_rows, num_cols), dtype=np.int16)
+    category_colors = ['white']
+    category_index = {}
+    
+    def get_category(css_color: str) -> int:
+        if css_color not in category_index:
+            category_index[css_color] = len(category_colors)
+            category_colors.append(css_color)
+        return category_index[css_color]
     
     # Cellules de la zone
-    for row in range(min_row, max_row + 1):
-        for col in range(min_col, max_col + 1):
-            if (row, col) in zone_cells:
-                # Convertir les coordonnées Excel en coordonnées Plotly
-                plot_col = col - min_col  # Position relative dans l'affichage
-                plot_row = row - min_row  # Position relative dans l'affichage
-                
-                r, g, b = hex_to_rgb(color_mapping['zone_color'])
-                shapes.append(dict(
-                    type="rect",
-                    x0=plot_col - 0.45,
-                    y0=plot_row - 0.45,
-                    x1=plot_col + 0.45,
-                    y1=plot_row + 0.45,
-                    fillcolor=f'rgba({r},{g},{b},0.3)',
-                    line=dict(width=0.5, color=f'rgb({r},{g},{b})'),
-                    layer="below"
-                ))
+    r, g, b = hex_to_rgb(color_mapping['zone_color'])
+    zone_category = get_category(f'rgba({r},{g},{b},0.3)')
+    for row, col in zone_cells:
+        if min_row <= row <= max_row and min_col <= col <= max_col:
+            # Convertir les coordonnées Excel en coordonnées Plotly
+            categories[row - min_row, col - min_col] = zone_category
     
     # Labels (par-dessus les zones)
-    for row in range(min_row, max_row + 1):
-        for col in range(min_col, max_col + 1):
-            if (row, col) in label_cells:
-                label = label_cells[(row, col)]
-                
-                # Convertir les coordonnées Excel en coordonnées Plotly
-                plot_col = col - min_col
-                plot_row = row - min_row
-                
-                # Déterminer la couleur du label
-                label_color = None
-                if 'label_colors' in color_mapping and label['type'] in color_mapping['label_colors']:
-                    label_color = color_mapping['label_colors'][label['type']]['color']
-                elif label['type'] == 'horizontal' and 'horizontal' in color_mapping.get('label_colors', {}):
-                    label_color = color_mapping['label_colors']['horizontal']['color']
-                elif label['type'] == 'vertical' and 'vertical' in color_mapping.get('label_colors', {}):
-                    label_color = color_mapping['label_colors']['vertical']['color']
-                
-                if label_color:
-                    r, g, b = hex_to_rgb(label_color)
-                    shapes.append(dict(
-                        type="rect",
-                        x0=plot_col - 0.45,
-                        y0=plot_row - 0.45,
-                        x1=plot_col + 0.45,
-                        y1=plot_row + 0.45,
-                        fillcolor=f'rgba({r},{g},{b},0.5)',
-                        line=dict(width=1, color=f'rgb({r},{g},{b})'),
-                        layer="below"
-                    ))
+    for (row, col), label in label_cells.items():
+        if not (min_row <= row <= max_row and min_col <= col <= max_col):
+            continue
+        
+        # Déterminer la couleur du label
+        label_color = None
+        if 'label_colors' in color_mapping and label['type'] in color_mapping['label_colors']:
+            label_color = color_mapping['label_colors'][label['type']]['color']
+        elif label['type'] == 'horizontal' and 'horizontal' in color_mapping.get('label_colors', {}):
+            label_color = color_mapping['label_colors']['horizontal']['color']
+        elif label['type'] == 'vertical' and 'vertical' in color_mapping.get('label_colors', {}):
+            label_color = color_mapping['label_colors']['vertical']['color']
+        
+        if label_color:
+            r, g, b = hex_to_rgb(label_color)
+            categories[row - min_row, col - min_col] = get_category(f'rgba({r},{g},{b},0.5)')
+    
+    # Créer la figure
+    fig = go.Figure()
+    
+    # Une seule heatmap pour le texte, les cellules de zone et les labels
+    fig.add_trace(_category_heatmap(
+        categories,
+        category_colors,
+        x_coords,  # Coordonnées numériques
+        y_coords,  # Coordonnées numériques
+        text_values,
+        customdata,
+        '%{customdata}: %{text}<extra></extra>',
+        12
+    ))
+    
+    shapes = []
     
     # Ajouter un cadre autour de la zone principale avec coordonnées corrigées
     zone_min_row_plot = bounds['min_row'] - min_row
@@ -520,9 +537,9 @@ def create_dataframe_view(workbook, sheet_name: str, zones: List[Dict] = None,
     """
     ws = workbook[sheet_name]
     
-    # Limiter les dimensions pour la performance
-    max_row = min(ws.max_row, max_rows)
-    max_col = min(ws.max_column, 26)
+    # Limiter les dimensions pour la performance (max_row peut être None en lecture seule)
+    max_row = min(ws.max_row or max_rows, max_rows)
+    max_col = min(ws.max_column or 26, 26)
     
     # Créer un mapping des cellules colorées
     colored_cells = {}
@@ -560,14 +577,15 @@ def create_dataframe_view(workbook, sheet_name: str, zones: List[Dict] = None,
     data = []
     columns = [num_to_excel_col(i) for i in range(1, max_col + 1)]
     
-    for row in range(1, max_row + 1):
-        row_data = []
-        for col in range(1, max_col + 1):
-            cell = ws.cell(row=row, column=col)
-            value = cell.value if cell.value is not None else ""
-            row_data.append(str(value))
+    # Lecture en flux des valeurs seules, sans instancier une cellule par ws.cell()
+    for values in ws.iter_rows(min_row=1, max_row=max_row, max_col=max_col, values_only=True):
+        row_data = ["" if value is None else str(value) for value in values]
+        row_data.extend([""] * (max_col - len(row_data)))
         data.append(row_data)
     
+    # Compléter si la feuille a moins de lignes que prévu
+    data.extend([[""] * max_col for _ in range(max_row - len(data))])
+    
     # Créer le DataFrame
     df = pd.DataFrame(data, columns=columns, index=range(1, max_row + 1))
     
@@ -575,30 +593,26 @@ def create_dataframe_view(workbook, sheet_name: str, zones: List[Dict] = None,
     if not zones or not color_mapping:
         return df
     
-    # Appliquer le style avec les couleurs
+    # Matrice de styles calculée une seule fois, en ne visitant que les cellules colorées
+    style_arr = np.full((max_row, max_col), '', dtype=object)
+    css_cache = {}
+    for (row_num, col_num), cell_info in colored_cells.items():
+        color = cell_info['color']
+        css = css_cache.get((color, cell_info['type']))
+        if css is None:
+            # Calculer une couleur de texte contrastante
+            r, g, b, text_color = rgb_and_text_color(color)
+            
+            if cell_info['type'] == 'zone':
+                css = f'background-color: #{color}; color: {text_color}; border: 2px solid #{color};'
+            else:
+                css = f'background-color: #{color}; color: {text_color}; border: 2px solid #{color}; font-weight: bold;'
+            css_cache[(color, cell_info['type'])] = css
+        style_arr[row_num - 1, col_num - 1] = css
+    
     def style_cells(val):
-        """Fonction pour styler les cellules"""
-        styles = pd.DataFrame('', index=df.index, columns=df.columns)
-        
-        for row_idx, row_num in enumerate(df.index, 1):
-            for col_idx, col_name in enumerate(df.columns):
-                col_num = excel_col_to_num(col_name)
-                
-                if (row_num, col_num) in colored_cells:
-                    cell_info = colored_cells[(row_num, col_num)]
-                    color = cell_info['color']
-                    
-                    # Calculer une couleur de texte contrastante
-                    r, g, b = hex_to_rgb(color)
-                    brightness = (r * 299 + g * 587 + b * 114) / 1000
-                    text_color = 'white' if brightness < 128 else 'black'
-                    
-                    if cell_info['type'] == 'zone':
-                        styles.iloc[row_idx-1, col_idx] = f'background-color: #{color}; color: {text_color}; border: 2px solid #{color};'
-                    elif cell_info['type'] == 'label':
-                        styles.iloc[row_idx-1, col_idx] = f'background-color: #{color}; color: {text_color}; border: 2px solid #{color}; font-weight: bold;'
-        
-        return styles
+        """Fonction pour styler les cellules (matrice précalculée)"""
+        return pd.DataFrame(style_arr, index=df.index, columns=df.columns)
     
     # Appliquer le style
     try:
@@ -645,55 +659,43 @@ def create_zone_detail_table_view(workbook, sheet_name: str, zone: Dict, color_m
     data = []
     columns = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
     
-    for row in range(min_row, max_row + 1):
-        row_data = []
-        for col in range(min_col, max_col + 1):
-            cell = ws.cell(row=row, column=col)
-            value = cell.value if cell.value is not None else ""
-            row_data.append(str(value))
-        data.append(row_data)
+    # Lecture en flux du bloc de valeurs, sans ws.cell() par cellule
+    for values in ws.iter_rows(min_row=min_row, max_row=max_row,
+                               min_col=min_col, max_col=max_col, values_only=True):
+        data.append(["" if value is None else str(value) for value in values])
     
     # Créer le DataFrame
     df = pd.DataFrame(data, columns=columns, index=range(min_row, max_row + 1))
     
     
-    def style_zone_cells(val):
-        """Fonction pour styler les cellules de la zone"""
-        styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    n_rows, n_cols = max_row - min_row + 1, max_col - min_col + 1
+    
+    # Styles calculés une seule fois en ne visitant que les cellules de la zone et les labels
+    style_arr = np.full((n_rows, n_cols), '', dtype=object)
+    zone_color = color_mapping['zone_color']
+    r, g, b, text_color = rgb_and_text_color(zone_color)
+    zone_css = f'background-color: #{zone_color}; color: {text_color}; font-weight: bold; border: 2px solid #{zone_color};'
+    for row, col in zone_cells:
+        if min_row <= row <= max_row and min_col <= col <= max_col:
+            style_arr[row - min_row, col - min_col] = zone_css
+    
+    # Labels (uniquement hors des cellules de zone)
+    for (row, col), label in label_cells.items():
+        if not (min_row <= row <= max_row and min_col <= col <= max_col) or (row, col) in zone_cells:
+            continue
         
-        for row_idx in range(len(df)):
-            actual_row = df.index[row_idx]  # Ligne réelle dans Excel
-            
-            for col_idx in range(len(df.columns)):
-                col_name = df.columns[col_idx]  # Nom de colonne (A, B, C...)
-                col_num = excel_col_to_num(col_name)  # Numéro de colonne
-                
-                # Vérifier si c'est une cellule de zone
-                if (actual_row, col_num) in zone_cells:
-                    zone_color = color_mapping['zone_color']
-                    r, g, b = hex_to_rgb(zone_color)
-                    brightness = (r * 299 + g * 587 + b * 114) / 1000
-                    text_color = 'white' if brightness < 128 else 'black'
-                    
-                    styles.iloc[row_idx, col_idx] = f'background-color: #{zone_color}; color: {text_color}; font-weight: bold; border: 2px solid #{zone_color};'
-                
-                # Vérifier si c'est un label (priorité sur la zone)
-                elif (actual_row, col_num) in label_cells:
-                    label = label_cells[(actual_row, col_num)]
-                    
-                    # Déterminer la couleur du label
-                    label_color = None
-                    if 'label_colors' in color_mapping and label['type'] in color_mapping['label_colors']:
-                        label_color = color_mapping['label_colors'][label['type']]['color']
-                    
-                    if label_color:
-                        r, g, b = hex_to_rgb(label_color)
-                        brightness = (r * 299 + g * 587 + b * 114) / 1000
-                        text_color = 'white' if brightness < 128 else 'black'
-                        
-                        styles.iloc[row_idx, col_idx] = f'background-color: #{label_color}; color: {text_color}; font-weight: bold; border: 3px solid #{label_color}; box-shadow: 0 0 5px rgba({r},{g},{b},0.7);'
+        # Déterminer la couleur du label
+        label_color = None
+        if 'label_colors' in color_mapping and label['type'] in color_mapping['label_colors']:
+            label_color = color_mapping['label_colors'][label['type']]['color']
         
-        return styles
+        if label_color:
+            r, g, b, text_color = rgb_and_text_color(label_color)
+            style_arr[row - min_row, col - min_col] = f'background-color: #{label_color}; color: {text_color}; font-weight: bold; border: 3px solid #{label_color}; box-shadow: 0 0 5px rgba({r},{g},{b},0.7);'
+    
+    def style_zone_cells(val):
+        """Fonction pour styler les cellules de la zone (matrice précalculée)"""
+        return pd.DataFrame(style_arr, index=df.index, columns=df.columns)
 
  # Appliquer le style
     try:
@@ -728,11 +730,14 @@ def create_zone_detail_table_view_enhanced(workbook, sheet_name: str, zone: Dict
     columns = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
     data = []
     
-    for row in range(min_row, max_row + 1):
+    # Lecture en flux du bloc de valeurs, sans ws.cell() par cellule
+    rows = ws.iter_rows(min_row=min_row, max_row=max_row,
+                        min_col=min_col, max_col=max_col, values_only=True)
+    for row, values in zip(range(min_row, max_row + 1), rows):
         row_data = []
-        for col in range(min_col, max_col + 1):
-            cell = ws.cell(row=row, column=col)
-            value = cell.value if cell.value is not None else ""
+        for col, value in zip(range(min_col, max_col + 1), values):
+            if value is None:
+                value = ""
             
             # Ajouter des indicateurs visuels dans le texte
             if (row, col) in zone_cells:
@@ -749,38 +754,33 @@ def create_zone_detail_table_view_enhanced(workbook, sheet_name: str, zone: Dict
     
     df = pd.DataFrame(data, columns=columns, index=range(min_row, max_row + 1))
     
-    # Style avancé avec CSS
-    def enhanced_style(x):
-        """Style avancé pour le tableau"""
-        styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    n_rows, n_cols = max_row - min_row + 1, max_col - min_col + 1
+    
+    # Style avancé avec CSS, en ne visitant que les cellules de la zone et les labels
+    style_arr = np.full((n_rows, n_cols), '', dtype=object)
+    zone_color = color_mapping['zone_color']
+    r, g, b = hex_to_rgb(zone_color)
+    zone_css = f'background-color: rgba({r}, {g}, {b}, 0.3); border: 3px solid #{zone_color}; font-weight: bold; text-align: center;'
+    for row, col in zone_cells:
+        if min_row <= row <= max_row and min_col <= col <= max_col:
+            style_arr[row - min_row, col - min_col] = zone_css
+    
+    for (row, col), label in label_cells.items():
+        if not (min_row <= row <= max_row and min_col <= col <= max_col) or (row, col) in zone_cells:
+            continue
         
-        for row_idx in range(len(df)):
-            actual_row = df.index[row_idx]
-            
-            for col_idx in range(len(df.columns)):
-                col_name = df.columns[col_idx]
-                col_num = excel_col_to_num(col_name)
-                
-                if (actual_row, col_num) in zone_cells:
-                    # Style pour cellules de zone
-                    zone_color = color_mapping['zone_color']
-                    r, g, b = hex_to_rgb(zone_color)
-                    
-                    styles.iloc[row_idx, col_idx] = f'background-color: rgba({r}, {g}, {b}, 0.3); border: 3px solid #{zone_color}; font-weight: bold; text-align: center;'
-                
-                elif (actual_row, col_num) in label_cells:
-                    # Style pour labels
-                    label = label_cells[(actual_row, col_num)]
-                    label_color = None
-                    
-                    if 'label_colors' in color_mapping and label['type'] in color_mapping['label_colors']:
-                        label_color = color_mapping['label_colors'][label['type']]['color']
-                    
-                    if label_color:
-                        r, g, b = hex_to_rgb(label_color)
-                        styles.iloc[row_idx, col_idx] = f'background-color: rgba({r}, {g}, {b}, 0.5); border: 2px solid #{label_color}; font-weight: bold; font-style: italic; text-align: center;'
+        # Style pour labels
+        label_color = None
+        if 'label_colors' in color_mapping and label['type'] in color_mapping['label_colors']:
+            label_color = color_mapping['label_colors'][label['type']]['color']
         
-        return styles
+        if label_color:
+            r, g, b = hex_to_rgb(label_color)
+            style_arr[row - min_row, col - min_col] = f'background-color: rgba({r}, {g}, {b}, 0.5); border: 2px solid #{label_color}; font-weight: bold; font-style: italic; text-align: center;'
+    
+    def enhanced_style(x):
+        """Style avancé pour le tableau (matrice précalculée)"""
+        return pd.DataFrame(style_arr, index=df.index, columns=df.columns)
     
     try:
         styled_df = df.style.apply(enhanced_style, axis=None)
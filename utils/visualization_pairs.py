@@ -4,6 +4,7 @@ Module de visualisation adapté pour le système de paires de labels alternées
 
 import plotly.graph_objects as go
 import pandas as pd
+from collections import defaultdict
 from typing import List, Dict, Optional
 from .excel_utils import num_to_excel_col, get_cell_color
 from .color_detector import hex_to_rgb
@@ -60,17 +61,20 @@ def create_zone_detail_view_with_pairs(workbook, sheet_name: str, zone: Dict, co
     text_values = []
     customdata = []
     
+    # Lettres des colonnes affichées, calculées une seule fois
+    col_letters = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
+    
     for row in range(min_row, max_row + 1):
         row_values = []
         row_text = []
         row_custom = []
         
-        for col in range(min_col, max_col + 1):
+        for col, col_letter in zip(range(min_col, max_col + 1), col_letters):
             cell = ws.cell(row=row, column=col)
             value = cell.value if cell.value is not None else ""
             row_text.append(str(value))
             row_values.append(1)
-            row_custom.append(f"{num_to_excel_col(col)}{row}")
+            row_custom.append(f"{col_letter}{row}")
         
         z_values.append(row_values)
         text_values.append(row_text)
@@ -79,7 +83,7 @@ def create_zone_detail_view_with_pairs(workbook, sheet_name: str, zone: Dict, co
     # Dimensions et coordonnées
     num_rows = max_row - min_row + 1
     num_cols = max_col - min_col + 1
-    x_labels = [num_to_excel_col(i) for i in range(min_col, max_col + 1)]
+    x_labels = col_letters
     y_labels = [str(i) for i in range(min_row, max_row + 1)]
     x_coords = list(range(num_cols))
     y_coords = list(range(num_rows))
@@ -269,7 +273,6 @@ def create_pair_analysis_chart(zones: List[Dict], color_palette: Dict) -> go.Fig
     """
     Crée un graphique d'analyse des paires de labels
     """
-    from collections import defaultdict
     
     # Analyser la distribution des labels par paire
     pair_stats = defaultdict(lambda: {
@@ -331,7 +334,6 @@ def create_zone_pair_heatmap(zones: List[Dict], color_palette: Dict) -> go.Figur
     """
     Crée une heatmap montrant la distribution des paires par zone
     """
-    from collections import defaultdict
     
     # Préparer la matrice
     num_pairs = len(color_palette.get('label_pairs', []))
@@ -144,6 +144,27 @@ def find_labels_for_zone_with_colors(zone: Dict, label_data: Dict) -> List[Dict]
     return labels
 
 
+# Types de labels du système 4 couleurs
+LABEL_TYPES = ('h1', 'h2', 'v1', 'v2')
+
+def count_labels_by_type(labels: List[Dict]) -> Dict[str, int]:
+    """Compte les labels par type (h1, h2, v1, v2)"""
+    counts = dict.fromkeys(LABEL_TYPES, 0)
+    for label in labels:
+        label_type = label.get('type', '')
+        if label_type in counts:
+            counts[label_type] += 1
+    return counts
+
+def get_label_counts(zone: Dict) -> Dict[str, int]:
+    """
+    Compteurs de labels par type d'une zone
+    Précalculés à la détection et à la fusion, recalculés si absents
+    """
+    if 'label_counts' not in zone:
+        zone['label_counts'] = count_labels_by_type(zone.get('labels', []))
+    return zone['label_counts']
+
 def detect_zones_with_two_colors(workbook, sheet_name: str, color_palette: Dict, color_cells: Dict) -> Tuple[List[Dict], Dict]:
     """
     Détecte les zones avec le système à 4 couleurs (zone + 2H + 2V)
@@ -159,7 +180,8 @@ def detect_zones_with_two_colors(workbook, sheet_name: str, color_palette: Dict,
     }
     """
     # Récupérer les cellules de zones
-    zone_cells = color_cells.get(color_palette['zone_color'], [])
+    # (tuple vide partagé pour les couleurs absentes : aucune liste temporaire allouée)
+    zone_cells = color_cells.get(color_palette['zone_color'], ())
     
     # Récupérer les cellules de headers
     h1_color = color_palette.get('h1_color')
@@ -167,10 +189,10 @@ def detect_zones_with_two_colors(workbook, sheet_name: str, color_palette: Dict,
     v1_color = color_palette.get('v1_color')
     v2_color = color_palette.get('v2_color')
     
-    h1_cells = color_cells.get(h1_color, []) if h1_color else []
-    h2_cells = color_cells.get(h2_color, []) if h2_color else []
-    v1_cells = color_cells.get(v1_color, []) if v1_color else []
-    v2_cells = color_cells.get(v2_color, []) if v2_color else []
+    h1_cells = color_cells.get(h1_color, ()) if h1_color else ()
+    h2_cells = color_cells.get(h2_color, ()) if h2_color else ()
+    v1_cells = color_cells.get(v1_color, ()) if v1_color else ()
+    v2_cells = color_cells.get(v2_color, ()) if v2_color else ()
     
     print(f"DEBUG detect_zones_with_two_colors:")
     print(f"  - Zone cells: {len(zone_cells)}")
@@ -193,6 +215,7 @@ def detect_zones_with_two_colors(workbook, sheet_name: str, color_palette: Dict,
     # Associer les labels aux zones et ajouter le nom de la feuille
     for zone in zones:
         zone['labels'] = find_labels_for_zone_with_colors(zone, label_data)
+        zone['label_counts'] = count_labels_by_type(zone['labels'])
         
         # Ajouter le nom de la feuille comme label
         zone['sheet_name'] = sheet_name
@@ -212,55 +235,75 @@ def group_contiguous_cells(cells: List[Dict]) -> List[Dict]:
     zones = []
     visited = set()
     
-    def get_neighbors(cell: Dict, all_cells: List[Dict]) -> List[Dict]:
-        """Trouve les voisins d'une cellule"""
-        neighbors = []
-        for c in all_cells:
-            if (c['row'], c['col']) in visited:
-                continue
-            # Cellules adjacentes (horizontalement ou verticalement)
-            if (abs(c['row'] - cell['row']) == 1 and c['col'] == cell['col']) or \
-               (abs(c['col'] - cell['col']) == 1 and c['row'] == cell['row']):
-                neighbors.append(c)
-        return neighbors
+    # Index position -> cellule : les voisins se trouvent par accès direct
+    # (4 recherches par cellule) au lieu d'un parcours de toutes les cellules
+    cell_by_pos = {}
+    for cell in cells:
+        cell_by_pos.setdefault((cell['row'], cell['col']), cell)
     
     # DFS pour trouver les zones contiguës
-    for i, cell in enumerate(cells):
-        cell_key = (cell['row'], cell['col'])
-        if cell_key not in visited:
-            zone_cells = []
-            stack = [cell]
+    for cell_key, cell in cell_by_pos.items():
+        if cell_key in visited:
+            continue
+        
+        visited.add(cell_key)
+        zone_cells = []
+        stack = [cell_key]
+        min_row = max_row = cell_key[0]
+        min_col = max_col = cell_key[1]
+        
+        while stack:
+            row, col = stack.pop()
+            zone_cells.append(cell_by_pos[(row, col)])
             
-            while stack:
-                current = stack.pop()
-                if (current['row'], current['col']) in visited:
-                    continue
-                
-                visited.add((current['row'], current['col']))
-                zone_cells.append(current)
-                stack.extend(get_neighbors(current, cells))
+            # Limites de la zone calculées pendant le parcours
+            if row < min_row:
+                min_row = row
+            elif row > max_row:
+                max_row = row
+            if col < min_col:
+                min_col = col
+            elif col > max_col:
+                max_col = col
             
-            if zone_cells:
-                # Calculer les limites de la zone
-                min_row = min(c['row'] for c in zone_cells)
-                max_row = max(c['row'] for c in zone_cells)
-                min_col = min(c['col'] for c in zone_cells)
-                max_col = max(c['col'] for c in zone_cells)
-                
-                zones.append({
-                    'id': len(zones) + 1,
-                    'cells': zone_cells,
-                    'bounds': {
-                        'min_row': min_row,
-                        'max_row': max_row,
-                        'min_col': min_col,
-                        'max_col': max_col
-                    },
-                    'cell_count': len(zone_cells)
-                })
+            # Cellules adjacentes (horizontalement ou verticalement)
+            for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if neighbor in cell_by_pos and neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+        
+        # Ordre ligne par ligne, indépendant du parcours (repris tel quel par les exports JSON)
+        zone_cells.sort(key=lambda c: (c['row'], c['col']))
+        
+        zones.append({
+            'id': len(zones) + 1,
+            'cells': zone_cells,
+            'bounds': {
+                'min_row': min_row,
+                'max_row': max_row,
+                'min_col': min_col,
+                'max_col': max_col
+            },
+            'cell_count': len(zone_cells)
+        })
     
     return zones
 
+def copy_zone(zone: Dict, new_id: int) -> Dict:
+    """
+    Copie indépendante d'une zone sous un nouvel id
+    Champs explicites : cellules, bornes et labels ne sont pas partagés avec l'original,
+    et les clés dérivées (label_counts...) ne sont pas recopiées
+    """
+    return {
+        'id': new_id,
+        'cells': list(zone['cells']),
+        'bounds': dict(zone['bounds']),
+        'cell_count': zone.get('cell_count', len(zone['cells'])),
+        'labels': [dict(label) for label in zone.get('labels', [])],
+        'sheet_name': zone.get('sheet_name', '')  # Conserver le nom de la feuille
+    }
+
 def merge_zones(zones: List[Dict], max_gap: int = 1) -> List[Dict]:
     """
     Fusionne les zones proches (avec un écart maximum)
@@ -276,13 +319,7 @@ def merge_zones(zones: List[Dict], max_gap: int = 1) -> List[Dict]:
         if i in used:
             continue
             
-        merged_zone = {
-            'id': len(merged) + 1,
-            'cells': zone1['cells'][:],
-            'bounds': zone1['bounds'].copy(),
-            'labels': zone1.get('labels', []),
-            'sheet_name': zone1.get('sheet_name', '')  # Conserver le nom de la feuille
-        }
+        merged_zone = copy_zone(zone1, len(merged) + 1)
         
         # Chercher les zones à fusionner
         for j, zone2 in enumerate(zones[i+1:], i+1):
@@ -316,10 +353,26 @@ def merge_zones(zones: List[Dict], max_gap: int = 1) -> List[Dict]:
                 used.add(j)
         
         merged_zone['cell_count'] = len(merged_zone['cells'])
+        merged_zone['label_counts'] = count_labels_by_type(merged_zone['labels'])
         merged.append(merged_zone)
     
     return merged
 
+def get_zone_by_id(zones: List[Dict], zone_id: int) -> Optional[Dict]:
+    """
+    Retrouve une zone par son id
+    Les ids sont attribués séquentiellement (1..N) : accès direct par index,
+    avec repli sur un parcours si la liste a été réordonnée
+    """
+    if zone_id is None:
+        return None
+    
+    index = zone_id - 1
+    if 0 <= index < len(zones) and zones[index]['id'] == zone_id:
+        return zones[index]
+    
+    return next((z for z in zones if z['id'] == zone_id), None)
+
 def are_zones_adjacent(bounds1: Dict, bounds2: Dict, max_gap: int = 1) -> bool:
     """
     Vérifie si deux zones sont adjacentes ou proches